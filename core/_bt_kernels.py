@@ -0,0 +1,93 @@
+"""
+Numeric kernels for the backtester.
+
+The hot loop (finding the candle where a trade first hits its stop-loss or take-profit)
+is compiled with Numba when it is installed. Without Numba a NumPy implementation with
+the same signature is used instead, so callers never need to care which one they get.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (supports both @njit and @njit(...))."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Exit codes returned by the kernels
+EXIT_NONE = 0
+EXIT_SL = 1
+EXIT_TP = 2
+
+
+@njit(cache=True, nogil=True)
+def _exit_decisions(sl_before_tp):
+    """Exit code indexed by hit_sl | hit_tp << 1 (neither, SL only, TP only, both)."""
+    decisions = np.empty(4, dtype=np.int8)
+    decisions[0] = EXIT_NONE
+    decisions[1] = EXIT_SL
+    decisions[2] = EXIT_TP
+    decisions[3] = EXIT_SL if sl_before_tp else EXIT_TP
+    return decisions
+
+
+@njit(cache=True, nogil=True)
+def _scan_exit(lows, highs, sl, tp, is_buy, decisions):
+    for i in range(lows.shape[0]):
+        low = lows[i]
+        high = highs[i]
+        if is_buy:
+            hit_sl = low <= sl
+            hit_tp = high >= tp
+        else:
+            hit_sl = high >= sl
+            hit_tp = low <= tp
+
+        # Branchless; a missing (NaN) price compares False, so only the side it belongs to is skipped
+        code = int(hit_sl) | (int(hit_tp) << 1)
+        if code:
+            return decisions[code]
+    return EXIT_NONE
+
+
+# Serial on purpose: the backtester already runs ticker groups on a thread pool, and Numba's
+# default threading layer is not safe to enter from several Python threads at once. The
+# kernels release the GIL (nogil) so those threads scan candles truly in parallel.
+@njit(cache=True, nogil=True)
+def _first_exits_loop(lows, highs, sls, tps, is_buy, sl_before_tp):
+    decisions = _exit_decisions(sl_before_tp)
+    codes = np.empty(sls.shape[0], dtype=np.int8)
+    for k in range(sls.shape[0]):
+        codes[k] = _scan_exit(lows, highs, sls[k], tps[k], is_buy[k], decisions)
+    return codes
+
+
+def _first_exits_numpy(lows, highs, sls, tps, is_buy, sl_before_tp):
+    if lows.shape[0] == 0:
+        return np.full(sls.shape[0], EXIT_NONE, dtype=np.int8)
+
+    # Broadcast every trade (rows) against every candle (columns); a missing (NaN) price compares
+    # False, so it only keeps its own side (SL or TP) from triggering
+    lo = lows[None, :]
+    hi = highs[None, :]
+    buy = is_buy[:, None]
+    sl_hit = np.where(buy, lo <= sls[:, None], hi >= sls[:, None])
+    tp_hit = np.where(buy, hi >= tps[:, None], lo <= tps[:, None])
+
+    # One fused mask: the first candle touching either level decides the exit
+    first = (sl_hit | tp_hit).argmax(axis=1)
+    rows = np.arange(sls.shape[0])
+    sl_first = sl_hit[rows, first]
+    tp_first = tp_hit[rows, first]
+
+    # Same decision table as the compiled kernel
+    return _exit_decisions(sl_before_tp)[sl_first.astype(np.intp) | (tp_first.astype(np.intp) << 1)]
+
+
+# first_exits(lows, highs, sls, tps, is_buy, sl_before_tp) -> int8 exit code per trade
+first_exits = _first_exits_loop if NUMBA_AVAILABLE else _first_exits_numpy
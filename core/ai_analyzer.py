@@ -1,23 +1,73 @@
 import os
-import json
+import asyncio
+import hashlib
+import tempfile
+import time
+import aiohttp
+import httpx
+import openai
 from openai import OpenAI
 import google.generativeai as genai
+from functools import cached_property
 from typing import Optional
 import re
+from .cache import ResponseCache, SemanticCache
+from utils import jsonutil
 
 from dotenv import load_dotenv
 load_dotenv()
 
+# Compiled once: these run on every AI response
+_FENCE_RE = re.compile(r'^```(?:json)?\s*|\s*```$', re.MULTILINE)
+_JSON_RE = re.compile(r'\{.*\}|\[.*\]', re.DOTALL)
+_SOURCE_RE = re.compile(r'\[(.*?)\]')
+
+# httpx defaults to a small connection pool, which throttles concurrent scoring
+_HTTP_LIMITS = httpx.Limits(
+    max_connections=int(os.getenv("AI_MAX_CONNECTIONS", "100")),
+    max_keepalive_connections=int(os.getenv("AI_MAX_KEEPALIVE", "50"))
+)
+_HTTP_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+OPENAI_CHAT_URL = "https://api.openai.com/v1/chat/completions"
+
+# Transient failures worth retrying; anything else (bad request, auth) fails immediately
+_RETRYABLE_ERRORS = (
+    openai.RateLimitError, openai.APIConnectionError, openai.APITimeoutError, openai.InternalServerError,
+    aiohttp.ClientConnectionError, asyncio.TimeoutError,
+)
+# google.api_core exceptions, matched by name so Gemini's SDK stays an import-time detail
+_RETRYABLE_ERROR_NAMES = {"ResourceExhausted", "ServiceUnavailable", "DeadlineExceeded", "InternalServerError"}
+
+
+class AIHTTPError(RuntimeError):
+    """Non-200 response from a raw HTTP call to the AI provider."""
+    def __init__(self, status: int, body: bytes, retry_after: Optional[str] = None):
+        super().__init__(f"AI provider returned HTTP {status}: {body[:200]!r}")
+        self.status = status
+        self.retry_after = retry_after
+
 class AIAnalyzer:
     """
     Uses an AI model to analyze text content like news headlines.
     Supports both OpenAI and Google Gemini models.
+
+    Provider clients are created lazily: the sync client on first use, and a raw aiohttp session
+    per `score_many` call (or per lone async call), closed again before its event loop finishes.
+    Create one AIAnalyzer per worker process rather than sharing one across a fork.
     """
     def __init__(self, api_key: str, prompts_path: str, provider: str = "openai", model_name: str = None):
         import os
         testing_mode = os.getenv("TESTING_MODE", "false").lower() == "true"
         self.prompts = self._load_prompts(prompts_path)
         self.asset_type_cache = {} # Add this line
+        # Retries with exponential backoff for rate limits and transient provider errors
+        self.max_retries = int(os.getenv("AI_MAX_RETRIES", "4"))
+        self.retry_backoff = float(os.getenv("AI_RETRY_BACKOFF", "1.0"))
+        # Persistent response cache so re-runs don't pay for identical prompts again (TTL 0 disables it)
+        self.cache_ttl = int(os.getenv("AI_CACHE_TTL_SEC", str(7 * 86400)))
+        self.cache = ResponseCache(os.getenv("AI_CACHE_PATH", ".cache/ai_responses.sqlite"), default_ttl=self.cache_ttl) if self.cache_ttl > 0 else None
+        self.asset_type_ttl = int(os.getenv("AI_ASSET_TYPE_TTL_SEC", str(90 * 86400)))
         if testing_mode:
             # When in testing mode, use Gemini and get the Gemini API key from environment
             gemini_key = os.getenv("GEMINI_API_KEY")
@@ -26,55 +76,125 @@ class AIAnalyzer:
             self.provider = "gemini"
             genai.configure(api_key=gemini_key)
             self.model_name = model_name or "gemini-1.5-flash"
-            self.client = genai.GenerativeModel(self.model_name)
         else:
             self.provider = provider.lower()
             if self.provider == "openai":
                 if not api_key:
                     raise ValueError("OpenAI API key is required.")
-                self.client = OpenAI(api_key=api_key)
+                self.api_key = api_key
                 self.model_name = model_name or "gpt-4o-mini"
             elif self.provider == "gemini":
                 if not api_key:
                     raise ValueError("Gemini API key is required.")
                 genai.configure(api_key=api_key)
                 self.model_name = model_name or "gemini-1.5-flash"
-                self.client = genai.GenerativeModel(self.model_name)
             else:
                 raise ValueError(f"Unsupported provider: {provider}. Use 'openai' or 'gemini'")
+        # Semantic headline cache: restated headlines reuse earlier asset extractions (OpenAI embeddings; 0 disables)
+        self.embedding_model = os.getenv("AI_EMBEDDING_MODEL", "text-embedding-3-small")
+        semantic_threshold = float(os.getenv("AI_SEMANTIC_CACHE_THRESHOLD", "0"))
+        self.semantic_cache = None
+        if semantic_threshold > 0 and self.provider == "openai":
+            self.semantic_cache = SemanticCache(
+                os.getenv("AI_SEMANTIC_CACHE_PATH", ".cache/headline_embeddings.npz"),
+                threshold=semantic_threshold
+            )
         print(f"AI Analyzer initialized with {self.provider.upper()} ({self.model_name})")
 
+    @cached_property
+    def client(self):
+        """The sync provider client, built on first use rather than at construction."""
+        if self.provider == "openai":
+            return OpenAI(
+                api_key=self.api_key,
+                http_client=httpx.Client(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT),
+                max_retries=0
+            )
+        return genai.GenerativeModel(self.model_name)
+
     def _load_prompts(self, path: str) -> dict:
         print(f"Loading AI prompts from: {path}")
         try:
-            with open(path, 'r') as f:
-                return json.load(f)
+            return jsonutil.load_file(path)
         except FileNotFoundError:
             print(f"Error: The prompts file was not found at '{path}'")
             return {}
-        except json.JSONDecodeError:
+        except jsonutil.JSONDecodeError:
             print(f"Error: Could not decode the JSON from '{path}'")
             return {}
 
     def _clean_ai_response(self, response_text: str) -> str:
         """Cleans and extracts JSON from AI responses, handling extra content."""
-        import re
-        
-        if response_text.startswith("```json"):
-            response_text = response_text[7:-3]
-        elif response_text.startswith("```"):
-            response_text = response_text[3:-3]
-        
-        json_pattern = r'\{.*\}|\[.*\]'
-        json_match = re.search(json_pattern, response_text, re.DOTALL)
-        
+        text = _FENCE_RE.sub('', response_text)
+        json_match = _JSON_RE.search(text)
         if json_match:
             return json_match.group(0).strip()
-        
-        return response_text.strip()
+        return text.strip()
     
+    def _cache_key(self, system_message: str, user_prompt: str, max_tokens: int) -> str:
+        raw = f"{self.provider}|{self.model_name}|0.1|{max_tokens}|{system_message}|{user_prompt}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _is_retryable(self, exc: Exception) -> bool:
+        if isinstance(exc, AIHTTPError):
+            return exc.status == 429 or exc.status >= 500
+        return isinstance(exc, _RETRYABLE_ERRORS) or type(exc).__name__ in _RETRYABLE_ERROR_NAMES
+
+    def _retry_delay(self, exc: Exception, attempt: int) -> float:
+        """Seconds to wait before the next attempt, honouring a Retry-After header when present."""
+        retry_after = getattr(exc, "retry_after", None)
+        response = getattr(exc, "response", None)
+        if retry_after is None and response is not None:
+            retry_after = response.headers.get("retry-after")
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), 60.0)
+            except ValueError:
+                pass
+        return min(self.retry_backoff * (2 ** attempt), 30.0)
+
+    def _with_retries(self, func):
+        """Calls func(), retrying transient provider errors with exponential backoff."""
+        attempt = 0
+        while True:
+            try:
+                return func()
+            except Exception as e:
+                if attempt >= self.max_retries or not self._is_retryable(e):
+                    raise
+                wait = self._retry_delay(e, attempt)
+                print(f"    [RETRY] AI call failed ({e}); attempt {attempt + 1}/{self.max_retries}, backing off {wait:.1f}s")
+                time.sleep(wait)
+                attempt += 1
+
+    async def _awith_retries(self, coro_factory):
+        """Async twin of `_with_retries`; coro_factory builds a fresh coroutine per attempt."""
+        attempt = 0
+        while True:
+            try:
+                return await coro_factory()
+            except Exception as e:
+                if attempt >= self.max_retries or not self._is_retryable(e):
+                    raise
+                wait = self._retry_delay(e, attempt)
+                print(f"    [RETRY] AI call failed ({e}); attempt {attempt + 1}/{self.max_retries}, backing off {wait:.1f}s")
+                await asyncio.sleep(wait)
+                attempt += 1
+
     def _call_ai_provider(self, system_message: str, user_prompt: str, max_tokens: int = 2000) -> str:
-        """Unified method to call either OpenAI or Gemini"""
+        """Unified method to call either OpenAI or Gemini, served from the response cache when possible."""
+        key = self._cache_key(system_message, user_prompt, max_tokens)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        response_text = self._with_retries(lambda: self._request_completion(system_message, user_prompt, max_tokens))
+        if self.cache is not None and response_text:
+            self.cache.set(key, response_text)
+        return response_text
+
+    def _request_completion(self, system_message: str, user_prompt: str, max_tokens: int) -> str:
         if self.provider == "openai":
             response = self.client.chat.completions.create(
                 model=self.model_name,
@@ -101,34 +221,198 @@ class AIAnalyzer:
         else:
             raise ValueError(f"Unsupported provider: {self.provider}")
 
+    def _stream_ai_provider(self, system_message: str, user_prompt: str, max_tokens: int = 2000):
+        """
+        Like `_call_ai_provider`, but yields the response text in chunks as the provider generates it.
+        A cached response is yielded in one piece; a completed stream is written to the cache.
+        """
+        key = self._cache_key(system_message, user_prompt, max_tokens)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        parts = []
+        if self.provider == "openai":
+            stream = self._with_retries(lambda: self.client.chat.completions.create(
+                model=self.model_name,
+                messages=[
+                    {"role": "system", "content": system_message},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=0.1,
+                max_tokens=max_tokens,
+                stream=True
+            ))
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield delta
+
+        elif self.provider == "gemini":
+            full_prompt = f"{system_message}\n\n{user_prompt}"
+            stream = self._with_retries(lambda: self.client.generate_content(
+                full_prompt,
+                generation_config=genai.types.GenerationConfig(
+                    temperature=0.1,
+                    max_output_tokens=max_tokens
+                ),
+                stream=True
+            ))
+            for chunk in stream:
+                delta = chunk.text
+                if delta:
+                    parts.append(delta)
+                    yield delta
+
+        else:
+            raise ValueError(f"Unsupported provider: {self.provider}")
+
+        if self.cache is not None and parts:
+            self.cache.set(key, ''.join(parts))
+
+    async def _acall_ai_provider(self, system_message: str, user_prompt: str, max_tokens: int = 2000,
+                                 session: Optional[aiohttp.ClientSession] = None) -> str:
+        """
+        Async twin of `_call_ai_provider` so many requests can overlap their network round-trips.
+        With OpenAI the request goes through the aiohttp `session` rather than the SDK; without one,
+        a session is opened just for this call.
+        """
+        key = self._cache_key(system_message, user_prompt, max_tokens)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        response_text = await self._awith_retries(lambda: self._arequest_completion(system_message, user_prompt, max_tokens, session))
+        if self.cache is not None and response_text:
+            self.cache.set(key, response_text)
+        return response_text
+
+    async def _raw_async_chat(self, session: aiohttp.ClientSession, system_message: str, user_prompt: str, max_tokens: int) -> str:
+        """Posts a chat completion straight to the OpenAI REST API, skipping the SDK's transport."""
+        payload = {
+            "model": self.model_name,
+            "messages": [
+                {"role": "system", "content": system_message},
+                {"role": "user", "content": user_prompt}
+            ],
+            "temperature": 0.1,
+            "max_tokens": max_tokens
+        }
+        headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
+        async with session.post(OPENAI_CHAT_URL, data=jsonutil.dumps(payload), headers=headers) as response:
+            body = await response.read()
+            if response.status != 200:
+                raise AIHTTPError(response.status, body, response.headers.get("Retry-After"))
+        data = jsonutil.loads(body)
+        return data["choices"][0]["message"]["content"]
+
+    async def _arequest_completion(self, system_message: str, user_prompt: str, max_tokens: int,
+                                   session: Optional[aiohttp.ClientSession] = None) -> str:
+        if self.provider == "openai":
+            if session is not None:
+                return await self._raw_async_chat(session, system_message, user_prompt, max_tokens)
+            # A lone call gets a session of its own, closed before its event loop can finish
+            async with self._open_session() as own_session:
+                return await self._raw_async_chat(own_session, system_message, user_prompt, max_tokens)
+
+        elif self.provider == "gemini":
+            # Gemini's async client stays bound to the first event loop it ran on, and every
+            # `score_many` batch runs in a fresh one (asyncio.run), so the sync client runs on a
+            # worker thread instead
+            full_prompt = f"{system_message}\n\n{user_prompt}"
+            response = await asyncio.to_thread(
+                self.client.generate_content,
+                full_prompt,
+                generation_config=genai.types.GenerationConfig(
+                    temperature=0.1,
+                    max_output_tokens=max_tokens
+                )
+            )
+            return response.text
+
+        else:
+            raise ValueError(f"Unsupported provider: {self.provider}")
+
+    def _embed(self, texts: list[str]) -> list[list[float]]:
+        """Embeds texts with a single OpenAI embeddings call, returned in input order."""
+        response = self.client.embeddings.create(model=self.embedding_model, input=texts)
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
     def identify_assets_from_headlines(self, headlines: list[str]) -> list[dict]:
         if not self.prompts or "identify_assets" not in self.prompts:
             print("Error: 'identify_assets' prompt not found in config.")
             return []
+
+        # Headlines close enough to one seen before reuse that headline's assets without an AI call
+        cached_assets = []
+        new_vectors = None
+        if self.semantic_cache is not None and headlines:
+            try:
+                vectors = self._embed(headlines)
+                misses = []
+                for headline, vector, hit in zip(headlines, vectors, self.semantic_cache.lookup(vectors)):
+                    if hit is None:
+                        misses.append((headline, vector))
+                    else:
+                        cached_assets.extend(jsonutil.loads(hit))
+                print(f"    ...{len(headlines) - len(misses)} of {len(headlines)} headlines served from semantic cache.")
+                headlines = [headline for headline, _ in misses]
+                new_vectors = [vector for _, vector in misses]
+                if not headlines:
+                    return cached_assets
+            except Exception as e:
+                print(f"    [WARNING] Semantic cache lookup failed, analyzing all headlines: {e}")
+                cached_assets, new_vectors = [], None
+
         headlines_text = "\n".join(headlines)
         prompt_config = self.prompts["identify_assets"]
         final_prompt = prompt_config["user_prompt_template"].format(headlines=headlines_text)
         print(f"--> Sending headlines to {self.provider.upper()} for initial analysis...")
         try:
-            response_text = self._call_ai_provider(
+            # Stream the response and tag each asset's source the moment its object closes
+            parser = jsonutil.IncrementalJsonArrayParser()
+            assets = []
+            for delta in self._stream_ai_provider(
                 prompt_config["system_message"],
                 final_prompt,
                 max_tokens=2000
-            )
-            response_text = self._clean_ai_response(response_text)
+            ):
+                for asset in parser.feed(delta):
+                    catalyst = asset.get('catalyst', '')
+                    source_match = _SOURCE_RE.match(catalyst)
+                    if source_match:
+                        asset['source'] = source_match.group(1)
+                    assets.append(asset)
+            if not parser.closed:
+                raise ValueError("Response did not contain a complete JSON array")
             print("    ...initial analysis complete.")
             
-            assets = json.loads(response_text)
-            for asset in assets:
-                catalyst = asset.get('catalyst', '')
-                source_match = re.match(r'\[(.*?)\]', catalyst)
-                if source_match:
-                    asset['source'] = source_match.group(1)
-            return assets
-            
         except Exception as e:
             print(f"    [FAILED] Error during initial AI analysis: {e}")
-            return []
+            return cached_assets
+
+        if new_vectors is not None:
+            self._remember_headline_assets(headlines, new_vectors, assets)
+        return cached_assets + assets
+
+    def _remember_headline_assets(self, headlines: list[str], vectors: list, assets: list[dict]):
+        """Attributes each asset to its closest headline by catalyst embedding and caches the result."""
+        try:
+            per_headline = [[] for _ in headlines]
+            if assets:
+                catalyst_vectors = SemanticCache._normalize(self._embed([a.get('catalyst', '') or a.get('ticker', '') for a in assets]))
+                closest = (catalyst_vectors @ SemanticCache._normalize(vectors).T).argmax(axis=1)
+                for asset, j in zip(assets, closest):
+                    per_headline[j].append(asset)
+            self.semantic_cache.add(vectors, [jsonutil.dumps(items) for items in per_headline])
+        except Exception as e:
+            print(f"    [WARNING] Could not update semantic cache: {e}")
 
     def get_ticker_details(self, ticker: str) -> dict:
         """
@@ -148,7 +432,7 @@ class AIAnalyzer:
                 max_tokens=100
             )
             response_text = self._clean_ai_response(response_text)
-            return json.loads(response_text)
+            return jsonutil.loads(response_text)
         except Exception as e:
             print(f"    [FAILED] AI enrichment failed for '{ticker}': {e}")
             return {}
@@ -176,17 +460,182 @@ class AIAnalyzer:
             )
             response_text = self._clean_ai_response(response_text)
             print("        ...detailed scoring complete.")
-            return json.loads(response_text)
+            return jsonutil.loads(response_text)
         except Exception as e:
             print(f"        [FAILED] Error during detailed AI scoring: {e}")
             return {}
 
-    def get_asset_type(self, ticker: str) -> Optional[str]:
+    async def a_get_detailed_scores(self, ticker: str, catalyst_headline: str,
+                                    session: Optional[aiohttp.ClientSession] = None) -> dict:
         """
-        Uses AI to determine the asset type of a ticker, with caching.
+        Async version of `get_detailed_scores`, used by `score_many` to score assets concurrently.
+        """
+        if not self.prompts or "score_asset" not in self.prompts:
+            print("Error: 'score_asset' prompt not found in config.")
+            return {}
+
+        prompt_config = self.prompts["score_asset"]
+        final_prompt = prompt_config["user_prompt_template"].format(
+            ticker=ticker,
+            catalyst_headline=catalyst_headline
+        )
+
+        print(f"    --> Performing detailed {self.provider.upper()} scoring for '{ticker}'...")
+        try:
+            response_text = await self._acall_ai_provider(
+                prompt_config["system_message"],
+                final_prompt,
+                max_tokens=1500,
+                session=session
+            )
+            response_text = self._clean_ai_response(response_text)
+            print(f"        ...detailed scoring complete for '{ticker}'.")
+            return jsonutil.loads(response_text)
+        except Exception as e:
+            print(f"        [FAILED] Error during detailed AI scoring for '{ticker}': {e}")
+            return {}
+
+    async def score_many(self, items: list[tuple], concurrency: int = 20) -> list:
+        """
+        Scores many (ticker, catalyst_headline) pairs concurrently.
+
+        Requests are bounded by a semaphore so we don't trip provider rate limits. Results are
+        returned in the same order as `items`; failed entries come back as {}. With OpenAI, each
+        call opens its own aiohttp session (so overlapping calls never share one) and sends the
+        requests through it rather than the SDK client.
+        """
+        sem = asyncio.Semaphore(concurrency)
+
+        async def gather(session=None):
+            async def one(item):
+                async with sem:
+                    return await self.a_get_detailed_scores(*item, session=session)
+            return await asyncio.gather(*(one(item) for item in items))
+
+        if self.provider != "openai":
+            return await gather()
+        async with self._open_session() as session:
+            return await gather(session)
+
+    @staticmethod
+    def _open_session() -> aiohttp.ClientSession:
+        """An aiohttp session sized like the sync client's pool; must be opened inside a running loop."""
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=_HTTP_LIMITS.max_connections),
+            timeout=aiohttp.ClientTimeout(total=60, connect=10)
+        )
+
+    def submit_scoring_batch(self, items: list[tuple]) -> str:
+        """
+        Submits (ticker, catalyst_headline) pairs to the OpenAI Batch API and returns the batch id.
+
+        Batch requests cost half as much as realtime calls and draw on a separate quota, at the
+        price of latency (results arrive within the 24h completion window). Each request's
+        custom_id is "<index>:<ticker>" so duplicate tickers keep their own result.
         """
+        if self.provider != "openai":
+            raise ValueError("Batch scoring is only supported with the OpenAI provider.")
+        if not self.prompts or "score_asset" not in self.prompts:
+            raise ValueError("'score_asset' prompt not found in config.")
+
+        prompt_config = self.prompts["score_asset"]
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False, encoding='utf-8') as f:
+            for i, (ticker, catalyst_headline) in enumerate(items):
+                final_prompt = prompt_config["user_prompt_template"].format(
+                    ticker=ticker,
+                    catalyst_headline=catalyst_headline
+                )
+                request = {
+                    "custom_id": f"{i}:{ticker}",
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": self.model_name,
+                        "messages": [
+                            {"role": "system", "content": prompt_config["system_message"]},
+                            {"role": "user", "content": final_prompt}
+                        ],
+                        "temperature": 0.1,
+                        "max_tokens": 1500
+                    }
+                }
+                f.write(jsonutil.dumps(request) + "\n")
+            batch_path = f.name
+
+        def upload():
+            with open(batch_path, 'rb') as f:
+                return self.client.files.create(file=f, purpose="batch")
+
+        try:
+            batch_file = self._with_retries(upload)
+        finally:
+            os.remove(batch_path)
+
+        batch = self._with_retries(lambda: self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        ))
+        print(f"--> Submitted {len(items)} scoring requests as OpenAI batch {batch.id}")
+        return batch.id
+
+    def poll_batch(self, batch_id: str, initial_wait: float = 10.0, max_wait: float = 300.0, timeout: float = 24 * 3600) -> dict:
+        """
+        Waits for a batch to finish (exponential backoff between polls) and returns
+        {custom_id: parsed_scores}. Requests that failed are left out of the result.
+        """
+        wait = initial_wait
+        deadline = time.time() + timeout
+        while True:
+            batch = self._with_retries(lambda: self.client.batches.retrieve(batch_id))
+            if batch.status == "completed":
+                break
+            if batch.status in ("failed", "expired", "cancelled"):
+                print(f"    [FAILED] Batch {batch_id} ended with status '{batch.status}'")
+                if not batch.output_file_id:
+                    return {}
+                break
+            if time.time() + wait > deadline:
+                raise TimeoutError(f"Batch {batch_id} did not complete within {timeout} seconds")
+            print(f"    ...batch {batch_id} is '{batch.status}', checking again in {wait:.0f}s")
+            time.sleep(wait)
+            wait = min(wait * 2, max_wait)
+
+        results = {}
+        output = self._with_retries(lambda: self.client.files.content(batch.output_file_id)).text
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            try:
+                entry = jsonutil.loads(line)
+                response = entry.get("response") or {}
+                if response.get("status_code") != 200:
+                    continue
+                content = response["body"]["choices"][0]["message"]["content"]
+                results[entry["custom_id"]] = jsonutil.loads(self._clean_ai_response(content))
+            except Exception as e:
+                print(f"    [FAILED] Could not parse batch result line: {e}")
+        print(f"    ...batch {batch_id} returned {len(results)} scored results.")
+        return results
+
+    def cached_asset_type(self, ticker: str) -> Optional[str]:
+        """The asset type already known for `ticker` (this run, or persisted by an earlier one), without asking the AI."""
         if ticker in self.asset_type_cache:
             return self.asset_type_cache[ticker]
+        if self.cache is not None:
+            asset_type = self.cache.get(f"asset_type:{ticker}")
+            if asset_type is not None:
+                self.asset_type_cache[ticker] = asset_type
+                return asset_type
+        return None
+
+    def get_asset_type(self, ticker: str) -> Optional[str]:
+        """
+        Uses AI to determine the asset type of a ticker, with caching.
+        """
+        cached = self.cached_asset_type(ticker)
+        if cached is not None:
+            return cached
 
         if not self.prompts or "get_asset_type" not in self.prompts:
             print("Error: 'get_asset_type' prompt not found in config.")
@@ -203,8 +652,10 @@ class AIAnalyzer:
             )
             asset_type = response_text.strip().lower()
             
-            # Cache the result
+            # Cache the result; a ticker's asset type doesn't change, so it persists longer than responses
             self.asset_type_cache[ticker] = asset_type
+            if self.cache is not None and asset_type:
+                self.cache.set(f"asset_type:{ticker}", asset_type, expire=self.asset_type_ttl)
             return asset_type
         except Exception as e:
             print(f"    [FAILED] AI asset type detection failed for '{ticker}': {e}")
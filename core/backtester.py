@@ -1,8 +1,126 @@
 import pandas as pd
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from .data_fetcher import DataFetcher
 from .output_manager import OutputManager
+from ._bt_kernels import first_exits, EXIT_NONE, EXIT_SL, EXIT_TP
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    import bottleneck as bn
+except ImportError:
+    bn = None
+
+from dotenv import load_dotenv
+load_dotenv()
+
+# precedence for intra-candle: stop-loss before take-profit when both hit (conservative); read once at import
+SL_BEFORE_TP = os.environ.get('BACKTEST_SL_BEFORE_TP', 'true').lower() in ('1', 'true', 'yes')
+
+# Currency symbols and reference markers that decorate prices in the signal sheet
+_PRICE_JUNK_RE = r'\$|\(ref\)'
+
+
+def _parse_prices(values, first_token: bool = False) -> np.ndarray:
+    """Parses price cells such as '$101.50 (ref)' into floats in one vectorized pass; bad cells become NaN.
+
+    With first_token, anything after the first space is dropped (e.g. '$105.00 (2.1%)').
+    """
+    # map(str) rather than astype(str): a column of only missing values must still become strings
+    prices = pd.Series(values, dtype=object).map(str)
+    if first_token:
+        prices = prices.str.split(' ', n=1).str[0]
+    prices = prices.str.replace(_PRICE_JUNK_RE, '', regex=True).str.strip()
+    return pd.to_numeric(prices, errors='coerce').to_numpy(dtype=np.float64)
+
+
+def _parse_signals(signals: list[dict]) -> pd.DataFrame:
+    """Normalizes raw signal dicts into one frame with float prices and a trade direction flag.
+
+    Field aliases (sheet columns vs. snake_case keys) are resolved per signal, then prices are
+    coerced column-wise; 'valid' marks rows that have every field and parse cleanly.
+    """
+    rows = []
+    for signal in signals:
+        ticker = signal.get('Ticker') or signal.get('ticker')
+        entry_price = signal.get('Entry') or signal.get('entry_price')
+        sl = signal.get('Stop Loss') or signal.get('stop_loss')
+        tp = signal.get('TP1') or signal.get('take_profit')
+        direction = signal.get('Signal') or signal.get('Direction') or signal.get('signal')
+        present = all([ticker, entry_price, sl, tp, direction])
+        rows.append((ticker, signal.get('asset_type', 'stocks'), entry_price, sl, tp, direction, present))
+
+    frame = pd.DataFrame(rows, columns=['ticker', 'asset_type', 'entry', 'sl', 'tp', 'direction', 'present'])
+    frame['entry'] = _parse_prices(frame['entry'])
+    frame['sl'] = _parse_prices(frame['sl'])
+    frame['tp'] = _parse_prices(frame['tp'], first_token=True)
+    directions = frame['direction'].astype(str).str.strip().str.lower()
+    frame['is_buy'] = (directions == 'buy').to_numpy()
+
+    # Only fully priced buy/sell signals can be traded
+    frame['valid'] = (frame['present'].to_numpy(dtype=bool)
+                      & frame[['entry', 'sl', 'tp']].notna().all(axis=1).to_numpy()
+                      & directions.isin(('buy', 'sell')).to_numpy())
+    return frame
+
+
+def _candle_arrays(market_data: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the (lows, highs) of a candle frame as contiguous float64 arrays.
+
+    Accepts both 'Low'/'High' and lowercase column names. A missing (NaN) price only keeps
+    its own side from triggering an exit; a candle with a cell that isn't a number at all is
+    skipped entirely (both prices become NaN). A frame missing either column yields empty
+    arrays, so its trades simply never exit.
+    """
+    low_col = 'Low' if 'Low' in market_data.columns else 'low'
+    high_col = 'High' if 'High' in market_data.columns else 'high'
+    if low_col not in market_data.columns or high_col not in market_data.columns:
+        empty = np.empty(0, dtype=np.float64)
+        return empty, empty
+    candles = market_data[[low_col, high_col]]
+    try:
+        prices = candles.to_numpy(dtype=np.float64)
+    except (TypeError, ValueError):
+        # Only frames with non-numeric cells pay for the element-wise coercion
+        coerced = candles.apply(pd.to_numeric, errors='coerce')
+        unparseable = (coerced.isna() & candles.notna()).any(axis=1)
+        prices = coerced.to_numpy(dtype=np.float64, copy=True)
+        prices[unparseable.to_numpy()] = np.nan
+    return np.ascontiguousarray(prices[:, 0]), np.ascontiguousarray(prices[:, 1])
+
+
+def _rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing maximum over the last `window` values (shorter at the start of the series)."""
+    if bn is not None:
+        return bn.move_max(values, window=window, min_count=1)
+    padded = np.concatenate((np.full(window - 1, -np.inf), values))
+    return sliding_window_view(padded, window).max(axis=1)
+
+
+def _max_drawdown_pct(portfolio_values: np.ndarray, lookback: int | None = None, epsilon: float = 0.0) -> float:
+    """Largest peak-to-trough decline of an equity curve, in percent (<= 0).
+
+    With `lookback`, the peak is the highest value of the last `lookback` points instead of
+    the all-time high. With `epsilon`, new highs less than epsilon (as a fraction of the
+    previous peak) above it don't reset the peak, so tiny gains don't split a drawdown run.
+    """
+    pv = portfolio_values
+    # A curve with no trades after the starting capital cannot have drawn down
+    if pv.size < 2:
+        return 0.0
+    effective = pv
+    if epsilon > 0:
+        prev_peak = np.maximum.accumulate(np.concatenate((pv[:1], pv[:-1])))
+        small_gain = (pv > prev_peak) & (pv - prev_peak < epsilon * prev_peak)
+        effective = np.where(small_gain, prev_peak, pv)
+    if lookback:
+        peak = _rolling_max(effective, lookback)
+    else:
+        peak = np.maximum.accumulate(effective)
+    return float(((pv - peak) / peak).min()) * 100
+
 
 class Backtester:
     """
@@ -14,68 +132,96 @@ class Backtester:
         self.data_fetcher = DataFetcher()
         self.initial_capital = initial_capital
         self.risk_per_trade_pct = risk_per_trade_pct
+        # Concurrent ticker fetches during a backtest
+        self.max_workers = int(os.getenv("BACKTEST_MAX_WORKERS", "16"))
+        # Candles fetched by earlier runs on this instance, dropped wholesale once older than the TTL
+        self.data_cache_ttl = float(os.getenv("BACKTEST_DATA_CACHE_TTL_SEC", "900"))
+        self._data_cache = {}
+        self._data_cache_started = time.monotonic()
 
     def run_backtest(self, signals: list[dict], days_to_backtest: int = 7,
-                     transaction_cost_pct: float = 0.001, slippage_pct: float = 0.0005) -> dict:
-        results = []
-        skipped = 0
-        processed = 0
-        
-        portfolio_values = [self.initial_capital]
-        current_capital = self.initial_capital
-        
+                     transaction_cost_pct: float = 0.001, slippage_pct: float = 0.0005,
+                     data_cache: dict = None, drawdown_lookback: int = None,
+                     drawdown_epsilon: float = 0.0) -> dict:
+        """
+        Backtests the given signals. Low/high candle arrays are cached per (ticker, asset_type) on
+        the instance for BACKTEST_DATA_CACHE_TTL_SEC, so repeated runs don't refetch (tickers whose
+        fetch failed are retried on every run); pass an explicit `data_cache` dict to control the
+        cache's lifetime yourself.
+
+        `drawdown_lookback` (trades) and `drawdown_epsilon` (fraction) tune the max drawdown
+        calculation, see _max_drawdown_pct; the defaults measure against the all-time peak.
+        """
+        pnls = self.trade_pnls(signals, transaction_cost_pct, slippage_pct, data_cache)
+        results = self.summarize(pnls, drawdown_lookback, drawdown_epsilon)
+        print(f"Backtest: Skipped {results['skipped_signals']} signals, evaluated {results['total_trades']} trades.")
+        return results
+
+    def trade_pnls(self, signals: list[dict], transaction_cost_pct: float = 0.001, slippage_pct: float = 0.0005,
+                   data_cache: dict = None) -> np.ndarray:
+        """
+        Simulates every signal and returns its profit as percent of the per-trade risk, in signal
+        order; NaN marks signals that were skipped (unparseable, or no candles for the ticker).
+
+        Trades are independent of each other, so the result for any subset of `signals` is the
+        matching subset of this array; see `summarize`.
+        """
+        # The instance cache only keeps real candles, so a failed fetch is retried on the next run;
+        # an explicit data_cache also remembers the misses
+        keep_missing = data_cache is not None
+        if data_cache is None:
+            data_cache = self._shared_data_cache()
+
         risk_amount_per_trade = self.initial_capital * (self.risk_per_trade_pct / 100)
 
-        for signal in signals:
-            ticker = signal.get('Ticker') or signal.get('ticker')
-            asset_type = signal.get('asset_type', 'stocks')
-            
-            data = self.data_fetcher.get_data(ticker, asset_type=asset_type)
-            if data is None or data.empty:
-                skipped += 1
-                continue
-    
-            processed += 1
-    
-            entry_price = signal.get('Entry') or signal.get('entry_price')
-            sl = signal.get('Stop Loss') or signal.get('stop_loss')
-            tp = signal.get('TP1') or signal.get('take_profit')
-            direction = signal.get('Signal') or signal.get('Direction') or signal.get('signal')
+        # Parse every signal's prices in one vectorized pass and drop the invalid ones before any
+        # fetching, then group by instrument so each ticker's candles are fetched and scanned once
+        frame = _parse_signals(signals)
+        tradable = frame[frame['valid'].to_numpy()]
+        groups: dict[tuple, list[int]] = {}
+        for position, key in enumerate(zip(tradable['ticker'], tradable['asset_type'])):
+            groups.setdefault(key, []).append(position)
 
-            if not all([ticker, entry_price, sl, tp, direction]):
-                skipped += 1
-                continue
+        pnls = np.full(len(frame), np.nan, dtype=np.float64)
+        max_workers = max(1, min(self.max_workers, len(groups)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Phase 1: fetching candles is network-bound, so download every missing ticker concurrently
+            fetched = {}
+            self._prefetch([key for key in groups if key not in data_cache], fetched, executor)
+            data_cache.update(fetched if keep_missing else {key: c for key, c in fetched.items() if c is not None})
+
+            # Phase 2: CPU-bound simulation against the cached arrays (the kernels release the GIL)
+            futures = [
+                executor.submit(self._evaluate_group, fetched[key] if key in fetched else data_cache[key],
+                                tradable.iloc[positions], transaction_cost_pct, slippage_pct, risk_amount_per_trade)
+                for key, positions in groups.items()
+            ]
+            for future in as_completed(futures):
+                group_pnls = future.result()
+                if group_pnls:
+                    pnls[list(group_pnls)] = list(group_pnls.values())
+        return pnls
+
+    def summarize(self, pnls: np.ndarray, drawdown_lookback: int = None, drawdown_epsilon: float = 0.0) -> dict:
+        """Performance metrics for per-signal P&L from `trade_pnls` (NaN entries count as skipped)."""
+        traded = ~np.isnan(pnls)
+        # Replay trades in the original signal order so the equity curve is unchanged
+        results_arr = pnls[traded]
+        risk_amount_per_trade = self.initial_capital * (self.risk_per_trade_pct / 100)
+        portfolio_values = np.empty(results_arr.size + 1, dtype=np.float64)
+        portfolio_values[0] = self.initial_capital
+        np.cumsum(risk_amount_per_trade * (results_arr / 100), out=portfolio_values[1:])
+        portfolio_values[1:] += self.initial_capital
 
-            try:
-                if isinstance(entry_price, str): entry_price = float(entry_price.replace('$', '').replace('(ref)', '').strip())
-                if isinstance(sl, str): sl = float(sl.replace('$', '').replace('(ref)', '').strip())
-                if isinstance(tp, str): tp = float(tp.split(' ')[0].replace('$', '').strip())
-            except (TypeError, ValueError):
-                skipped += 1
-                continue
-    
-            pnl_pct = self._simulate_trade(data, entry_price, sl, tp, direction, transaction_cost_pct, slippage_pct, risk_amount_per_trade)
-            
-            if pnl_pct is not None:
-                results.append(pnl_pct)
-                trade_pnl = risk_amount_per_trade * (pnl_pct / 100)
-                current_capital += trade_pnl
-                portfolio_values.append(current_capital)
-    
         # --- Performance Calculations ---
-        win_count = sum(1 for r in results if r > 0)
-        total_trades = len(results)
+        win_count = int((results_arr > 0).sum())
+        total_trades = int(results_arr.size)
         win_rate = (win_count / total_trades * 100) if total_trades > 0 else 0.0
         
-        final_portfolio_value = portfolio_values[-1]
+        final_portfolio_value = float(portfolio_values[-1])
         roi_pct = ((final_portfolio_value - self.initial_capital) / self.initial_capital) * 100
         
-        portfolio_series = pd.Series(portfolio_values)
-        peak = portfolio_series.expanding(min_periods=1).max()
-        drawdown = (portfolio_series - peak) / peak
-        max_drawdown_pct = drawdown.min() * 100 if not drawdown.empty else 0.0
-    
-        print(f"Backtest: Skipped {skipped} signals, processed {processed}, evaluated {total_trades} trades.")
+        max_drawdown_pct = _max_drawdown_pct(portfolio_values, drawdown_lookback, drawdown_epsilon)
     
         return {
             "total_trades": total_trades,
@@ -84,98 +230,107 @@ class Backtester:
             "losses": total_trades - win_count,
             "return_on_investment": roi_pct,
             "max_drawdown": max_drawdown_pct,
-            "skipped_signals": skipped
+            "skipped_signals": int(pnls.size - total_trades)
+        }
+
+    def _shared_data_cache(self) -> dict:
+        """Returns the instance-level candle cache, emptying it first if it has expired."""
+        if time.monotonic() - self._data_cache_started > self.data_cache_ttl:
+            self._data_cache = {}
+            self._data_cache_started = time.monotonic()
+        return self._data_cache
+
+    def _prefetch(self, keys: list[tuple], data_cache: dict, executor: ThreadPoolExecutor):
+        """Fetch candles for the given (ticker, asset_type) keys into data_cache.
+
+        Tickers are batched per asset type (see DataFetcher.get_many) and the asset types are
+        fetched concurrently. The cache keeps the extracted low/high arrays, or None when the
+        fetch came back empty or failed.
+        """
+        by_type: dict[str, list] = {}
+        for ticker, asset_type in keys:
+            by_type.setdefault(asset_type, []).append(ticker)
+
+        futures = {
+            executor.submit(self.data_fetcher.get_many, tickers, asset_type=asset_type): asset_type
+            for asset_type, tickers in by_type.items()
         }
+        for future in as_completed(futures):
+            asset_type = futures[future]
+            try:
+                frames = future.result()
+            except Exception as e:
+                # One asset type failing only skips its own signals
+                print(f"Warning: could not fetch {asset_type} candles: {e}")
+                frames = dict.fromkeys(by_type[asset_type])
+            for ticker, data in frames.items():
+                data_cache[(ticker, asset_type)] = None if data is None or data.empty else _candle_arrays(data)
 
-    def _simulate_trade(self, market_data: pd.DataFrame, entry: float, sl: float, tp: float, signal: str, 
-                        transaction_cost_pct: float, slippage_pct: float, risk_amount: float) -> float | None:
-        """Simulate trade over candles and return profit as percent of provided risk_amount.
+    def _evaluate_group(self, candles: tuple[np.ndarray, np.ndarray] | None, group: pd.DataFrame,
+                        transaction_cost_pct: float, slippage_pct: float,
+                        risk_amount: float) -> dict:
+        """Simulate one ticker's (already validated) signals against its prefetched candles.
 
-        Uses per-trade position sizing based on risk_amount and risk_per_share.
-        Applies slippage and commission on entry and exit. Handles intra-candle SL/TP with configurable precedence.
+        Returns {signal index: pnl percent}; empty when no candles could be fetched, which
+        leaves those signals skipped.
         """
-        signal = signal.lower()
+        if candles is None:
+            return {}
 
-        # Determine effective entry price after slippage
-        if signal == 'buy':
-            entry_effective = entry * (1 + slippage_pct)
-        else:  # sell
-            entry_effective = entry * (1 - slippage_pct)
+        lows, highs = candles
+        pnls = self._simulate_trades(lows, highs, group['entry'].to_numpy(), group['sl'].to_numpy(),
+                                     group['tp'].to_numpy(), group['is_buy'].to_numpy(),
+                                     transaction_cost_pct, slippage_pct, risk_amount)
+        return dict(zip(group.index.tolist(), pnls))
 
-        risk_per_share = abs(entry_effective - sl)
-        if risk_per_share == 0:
-            return 0.0
+    def _simulate_trades(self, lows: np.ndarray, highs: np.ndarray, entries: np.ndarray, sls: np.ndarray,
+                         tps: np.ndarray, is_buy: np.ndarray, transaction_cost_pct: float, slippage_pct: float,
+                         risk_amount: float) -> list[float]:
+        """Simulate several trades against the same candles in one batch.
 
-        # position size in shares based on risk allocated
-        position_size = risk_amount / risk_per_share
+        All trades are scanned together by the batch kernel; returns the profit of each trade
+        as percent of risk_amount, in input order.
+        """
+        if not len(entries):
+            return []
 
-        # precedence for intra-candle: stop-loss before take-profit when both hit (conservative)
-        sl_before_tp = os.environ.get('BACKTEST_SL_BEFORE_TP', 'true').lower() in ('1', 'true', 'yes')
+        exit_codes = first_exits(lows, highs, sls, tps, is_buy, SL_BEFORE_TP)
+        return self._exit_pnl_pcts(entries, sls, tps, is_buy, exit_codes,
+                                   transaction_cost_pct, slippage_pct, risk_amount).tolist()
 
-        for index, row in market_data.iterrows():
-            low = row.get('Low', row.get('low'))
-            high = row.get('High', row.get('high'))
+    def _exit_pnl_pcts(self, entries: np.ndarray, sls: np.ndarray, tps: np.ndarray, is_buy: np.ndarray,
+                       exit_codes: np.ndarray, transaction_cost_pct: float, slippage_pct: float,
+                       risk_amount: float) -> np.ndarray:
+        """Turn kernel exit codes into profit as percent of risk_amount for a batch of trades.
 
-            try:
-                low = float(low)
-                high = float(high)
-            except Exception:
-                continue
-
-            exit_price = None
-            exit_type = None
-
-            if signal == 'buy':
-                hit_sl = low <= sl
-                hit_tp = high >= tp
-                if hit_sl and hit_tp:
-                    exit_type = 'sl' if sl_before_tp else 'tp'
-                elif hit_sl:
-                    exit_type = 'sl'
-                elif hit_tp:
-                    exit_type = 'tp'
-                else:
-                    exit_type = None
-
-                if exit_type == 'sl':
-                    exit_price = sl
-                elif exit_type == 'tp':
-                    exit_price = tp
-
-            elif signal == 'sell':
-                hit_sl = high >= sl
-                hit_tp = low <= tp
-                if hit_sl and hit_tp:
-                    exit_type = 'sl' if sl_before_tp else 'tp'
-                elif hit_sl:
-                    exit_type = 'sl'
-                elif hit_tp:
-                    exit_type = 'tp'
-                else:
-                    exit_type = None
-
-                if exit_type == 'sl':
-                    exit_price = sl
-                elif exit_type == 'tp':
-                    exit_price = tp
-
-            if exit_price is not None:
-                # apply slippage to exit (adverse for the trader)
-                if signal == 'buy':
-                    exit_effective = exit_price * (1 - slippage_pct)
-                    profit_per_share = exit_effective - entry_effective
-                else:  # sell
-                    exit_effective = exit_price * (1 + slippage_pct)
-                    profit_per_share = entry_effective - exit_effective
-
-                # commission applied on both entry and exit (as absolute value)
-                commission_total = transaction_cost_pct * (abs(entry_effective) + abs(exit_effective)) * position_size
-
-                profit_dollars = (profit_per_share * position_size) - commission_total
-
-                # return percent relative to the risk amount provided
-                pnl_pct = (profit_dollars / risk_amount) * 100.0
-                return pnl_pct
-
-        # If neither SL nor TP hit in dataset, assume flat (zero) P&L
-        return 0.0
\ No newline at end of file
+        The P&L of every possible outcome (no exit, stop-loss, take-profit) is computed up front
+        per trade, and the exit code just picks a column. Buys and sells share one formula
+        through a +1/-1 direction sign, so there are no per-trade branches.
+        """
+        side = np.where(is_buy, 1.0, -1.0)
+
+        # Determine effective entry price after slippage (adverse for the trader)
+        entry_effective = entries * (1 + side * slippage_pct)
+        risk_per_share = np.abs(entry_effective - sls)
+
+        # With no risk there is no position; such trades count as flat (zero) P&L
+        has_risk = risk_per_share != 0
+        # position size in shares based on risk allocated
+        position_size = risk_amount / np.where(has_risk, risk_per_share, 1.0)
+
+        def outcome_pnl_pct(exit_price: np.ndarray) -> np.ndarray:
+            # apply slippage to exit (adverse for the trader)
+            exit_effective = exit_price * (1 - side * slippage_pct)
+            profit_per_share = side * (exit_effective - entry_effective)
+            # commission applied on both entry and exit (as absolute value)
+            commission_total = transaction_cost_pct * (np.abs(entry_effective) + np.abs(exit_effective)) * position_size
+            profit_dollars = (profit_per_share * position_size) - commission_total
+            # return percent relative to the risk amount provided
+            return np.where(has_risk, (profit_dollars / risk_amount) * 100.0, 0.0)
+
+        # Columns are indexed by exit code; if neither SL nor TP hit in dataset, assume flat (zero) P&L
+        pnl_table = np.empty((len(entries), 3), dtype=np.float64)
+        pnl_table[:, EXIT_NONE] = 0.0
+        pnl_table[:, EXIT_SL] = outcome_pnl_pct(sls)
+        pnl_table[:, EXIT_TP] = outcome_pnl_pct(tps)
+        return pnl_table[np.arange(len(entries)), exit_codes]
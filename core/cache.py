@@ -0,0 +1,242 @@
+import glob
+import hashlib
+import importlib.util
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Parquet needs pyarrow; without it frames are pickled, which pandas always supports
+_HAS_PARQUET = importlib.util.find_spec("pyarrow") is not None
+
+
+class ResponseCache:
+    """
+    A small persistent key/value cache backed by SQLite, with per-entry expiry.
+    Safe to share between threads; values are stored as text.
+    """
+    def __init__(self, path: str, default_ttl: Optional[float] = None):
+        """
+        Initializes the cache.
+
+        Args:
+            path: The SQLite file to store entries in (parent directories are created).
+            default_ttl: Seconds an entry stays valid when `set` is called without `expire`.
+        """
+        self.path = path
+        self.default_ttl = default_ttl
+        cache_dir = os.path.dirname(path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the cached value, or None if missing or expired."""
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at < time.time():
+            self.delete(key)
+            return None
+        return value
+
+    def set(self, key: str, value: str, expire: Optional[float] = None):
+        """Stores a value; `expire` (seconds) overrides the default TTL."""
+        ttl = expire if expire is not None else self.default_ttl
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at)
+            )
+
+    def delete(self, key: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class SemanticCache:
+    """
+    Nearest-neighbour cache keyed by text embeddings instead of exact strings.
+
+    Vectors are L2-normalised so a dot product is the cosine similarity; a lookup is a hit when
+    the best match reaches `threshold`. Entries are persisted to a NumPy .npz file and the oldest
+    ones are dropped beyond `max_entries`.
+    """
+    def __init__(self, path: str, threshold: float = 0.92, max_entries: int = 5000):
+        self.path = path
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._vectors = None
+        self._values = []
+        if os.path.exists(path):
+            try:
+                with np.load(path) as data:
+                    self._vectors = data["vectors"]
+                    self._values = [str(v) for v in data["values"]]
+            except Exception as e:
+                print(f"Warning: could not load semantic cache '{path}': {e}")
+                self._vectors, self._values = None, []
+
+    @staticmethod
+    def _normalize(vectors) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def lookup(self, vectors) -> list[Optional[str]]:
+        """Returns the cached value for each query vector, or None where nothing is close enough."""
+        queries = self._normalize(vectors)
+        with self._lock:
+            if self._vectors is None or not len(self._values):
+                return [None] * len(queries)
+            sims = queries @ self._vectors.T
+            values = list(self._values)
+        best = sims.argmax(axis=1)
+        return [values[j] if sims[i, j] >= self.threshold else None for i, j in enumerate(best)]
+
+    def add(self, vectors, values: list[str]):
+        """Adds (vector, value) entries and persists the cache."""
+        if not len(values):
+            return
+        new_vectors = self._normalize(vectors)
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = new_vectors
+            else:
+                self._vectors = np.vstack([self._vectors, new_vectors])
+            self._values.extend(values)
+            if len(self._values) > self.max_entries:
+                self._vectors = self._vectors[-self.max_entries:]
+                self._values = self._values[-self.max_entries:]
+            cache_dir = os.path.dirname(self.path)
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            with open(self.path, 'wb') as f:
+                np.savez(f, vectors=self._vectors, values=np.array(self._values, dtype=str))
+
+
+class FileCache:
+    """
+    Disk cache for DataFrames, one file per entry under `root/<namespace>/`.
+
+    Entries expire by file age (mtime); a TTL is passed on each `get`. Frames are written as
+    zstd-compressed Parquet when pyarrow is installed and pickled otherwise. Writes go through a
+    temp file and os.replace, so concurrent readers never see a partial file. With `max_bytes`
+    set, the oldest entries are deleted whenever the cache grows past that size.
+    """
+    def __init__(self, root: str, max_bytes: Optional[int] = None):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._ext = ".parquet" if _HAS_PARQUET else ".pkl"
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _slug(text: str) -> str:
+        return re.sub(r'[^A-Za-z0-9]+', '_', str(text)).strip('_') or '_'
+
+    def _path(self, namespace: str, name: str, key: str) -> str:
+        digest = hashlib.md5(key.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.root, self._slug(namespace), f"{self._slug(name)}_{digest}{self._ext}")
+
+    def get(self, namespace: str, name: str, key: str, ttl: float) -> Optional[pd.DataFrame]:
+        """Returns the cached frame, or None if missing, unreadable or older than `ttl` seconds."""
+        path = self._path(namespace, name, key)
+        try:
+            if time.time() - os.path.getmtime(path) > ttl:
+                return None
+            return pd.read_parquet(path) if _HAS_PARQUET else pd.read_pickle(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Warning: could not read cache file '{path}': {e}")
+            return None
+
+    def set(self, namespace: str, name: str, key: str, df: pd.DataFrame):
+        """Stores a frame, replacing any previous entry for the same key."""
+        path = self._path(namespace, name, key)
+        tmp_path = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            os.close(fd)
+            if _HAS_PARQUET:
+                df.to_parquet(tmp_path, compression='zstd')
+            else:
+                df.to_pickle(tmp_path)
+            # Replacing an entry only grows the cache by the difference in size
+            replaced = os.path.getsize(path) if self.max_bytes and os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            if self.max_bytes:
+                self._account(os.path.getsize(path) - replaced)
+        except Exception as e:
+            print(f"Warning: could not write cache file '{path}': {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _entries(self) -> list:
+        """(mtime, size, path) for every cache file."""
+        entries = []
+        for path in glob.glob(os.path.join(self.root, '*', f"*{self._ext}")):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _account(self, added: int):
+        """Tracks the total size (`added` may be negative) and evicts the oldest entries once it passes `max_bytes`."""
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            else:
+                self._size += added
+            if self._size <= self.max_bytes:
+                return
+            entries = sorted(self._entries())
+            self._size = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if self._size <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    self._size -= size
+                except OSError:
+                    pass
+
+    def invalidate(self, name: str):
+        """Drops every entry stored under `name` (e.g. a ticker), in all namespaces."""
+        slug = self._slug(name)
+        # Exactly `<name>_<digest><ext>`: "BTC" must not also match "BTC_USD_<digest>"
+        entry = re.compile(rf"{re.escape(slug)}_[0-9a-f]{{16}}{re.escape(self._ext)}")
+        for path in glob.glob(os.path.join(self.root, '*', f"{slug}_*")):
+            if not entry.fullmatch(os.path.basename(path)):
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -1,17 +1,73 @@
 from .data_fetcher import DataFetcher
 from .ai_analyzer import AIAnalyzer
+import functools
 import os
+import re
+from typing import Optional
+
+# Symbols that can be classified locally without an AI round-trip; set lookups need no regex backtracking
+CRYPTO_SYMBOLS = frozenset({
+    'BTC', 'ETH', 'BNB', 'XRP', 'SOL', 'ADA', 'DOGE', 'DOT', 'AVAX', 'MATIC', 'LTC', 'LINK',
+    'TRX', 'SHIB', 'UNI', 'XLM', 'ATOM', 'ETC', 'BCH', 'NEAR', 'APT', 'ARB', 'OP', 'TON',
+})
+CRYPTO_QUOTES = frozenset({'USDT', 'USDC', 'BUSD', 'USD', 'EUR', 'BTC', 'ETH'})
+FIAT_CURRENCIES = frozenset({
+    'USD', 'EUR', 'GBP', 'JPY', 'CHF', 'AUD', 'CAD', 'NZD', 'SEK', 'NOK', 'CNY', 'HKD',
+    'SGD', 'MXN', 'ZAR', 'TRY', 'INR',
+})
+INDEX_SYMBOLS = frozenset({'SPY', 'QQQ', 'DIA', 'IWM', 'VIX'})
+
+# Ticker shapes checked, in order, once the symbol sets above don't decide
+_ASSET_PATTERNS = [
+    ('indices', re.compile(r'^\^[A-Z]{2,6}$')),
+    ('stocks', re.compile(r'^[A-Z]{1,5}$')),
+]
+
+
+@functools.cache
+def _shared_fetcher() -> DataFetcher:
+    """One DataFetcher for every enricher in the process."""
+    return DataFetcher()
+
 
 class DataEnricher:
     """
     Takes a list of identified assets and enriches them with market data
     using an AI-driven, multi-source fetching strategy.
     """
+    asset_patterns = _ASSET_PATTERNS
+
     def __init__(self, analyzer: AIAnalyzer):
         """Initializes the DataEnricher with an AIAnalyzer instance."""
-        self.fetcher = DataFetcher()
+        self.fetcher = _shared_fetcher()
         self.analyzer = analyzer
 
+    def _determine_asset_type(self, ticker: str) -> Optional[dict]:
+        """
+        Classifies unambiguous tickers locally and formats them for Yahoo Finance, following the
+        same rules as the 'enrich_ticker' prompt. Returns None when the AI should decide.
+        """
+        upper_ticker = ticker.strip().upper()
+
+        # Pairs: crypto accepts BASE/QUOTE or BASE-QUOTE, forex only FIAT/FIAT
+        for sep in '/-':
+            if sep in upper_ticker:
+                base, _, quote = upper_ticker.partition(sep)
+                if base in CRYPTO_SYMBOLS and quote in CRYPTO_QUOTES:
+                    return {'asset_type': 'crypto', 'formatted_ticker': f"{base}-{quote}"}
+                if sep == '/' and base in FIAT_CURRENCIES and quote in FIAT_CURRENCIES:
+                    return {'asset_type': 'forex', 'formatted_ticker': f"{base}{quote}=X"}
+                return None
+
+        if upper_ticker in CRYPTO_SYMBOLS:
+            return {'asset_type': 'crypto', 'formatted_ticker': f"{upper_ticker}-USD"}
+        if upper_ticker in INDEX_SYMBOLS:
+            return {'asset_type': 'indices', 'formatted_ticker': upper_ticker}
+        for asset_type, pattern in self.asset_patterns:
+            if pattern.match(upper_ticker):
+                return {'asset_type': asset_type, 'formatted_ticker': upper_ticker}
+        return None
+
     def enrich_assets(self, assets: list[dict]) -> list[dict]:
         """
         Enriches each asset with its corresponding market data using AI for formatting.
@@ -24,8 +80,12 @@ class DataEnricher:
 
             print(f"--> Enriching '{original_ticker}' with market data...")
             
-            # Use AI to get asset type and formatted ticker
-            ticker_details = self.analyzer.get_ticker_details(original_ticker)
+            # Classify obvious tickers locally; only ambiguous ones need the AI
+            ticker_details = self._determine_asset_type(original_ticker)
+            source = "Pattern match"
+            if ticker_details is None:
+                ticker_details = self.analyzer.get_ticker_details(original_ticker)
+                source = "AI"
             
             if not ticker_details:
                 print(f"    ...FAILED to get enrichment details from AI for '{original_ticker}'.")
@@ -38,7 +98,7 @@ class DataEnricher:
                 print(f"    ...FAILED, AI returned incomplete data for '{original_ticker}'.")
                 continue
 
-            print(f"    ...AI identified as {asset_type.title()} with ticker '{ticker_to_fetch}'.")
+            print(f"    ...{source} identified as {asset_type.title()} with ticker '{ticker_to_fetch}'.")
             
             market_data = self.fetcher.get_data(
                 ticker=ticker_to_fetch, 
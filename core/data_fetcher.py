@@ -1,15 +1,87 @@
 import yfinance as yf
 import ccxt
+import asyncio
+import importlib.util
 import pandas as pd
+import numpy as np
 import os
-import json
+import random
 import requests
-from bs4 import BeautifulSoup
-from typing import Optional, Dict, List
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+from typing import Callable, NamedTuple, Optional, Dict, List, Tuple
 import concurrent.futures
+import threading
 import time as _time
-import math
+import re
+from datetime import date, timedelta
+from dateutil.tz import tzlocal
+from operator import itemgetter
 from utils.logger import logger
+from utils import jsonutil
+from .cache import FileCache
+
+try:
+    import ccxt.async_support as ccxt_async
+except ImportError:
+    ccxt_async = None
+
+try:
+    from polygon import RESTClient
+except ImportError:
+    RESTClient = None
+
+# Text directly inside Google Finance's price element, e.g. <div data-source="PRICE" ...>$189.98</div>
+_PRICE_RE = re.compile(rb'<div\b[^>]*\bdata-source="PRICE"[^>]*>\s*([^<\s][^<]*?)\s*<')
+
+# Column order and dtypes every fetcher returns. Prices stay float64 by default (exact SL/TP
+# comparisons in the backtester); OHLCV_PRICE_DTYPE=float32 halves memory for large scans.
+OHLCV_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume')
+_PRICE_DTYPE = os.environ.get('OHLCV_PRICE_DTYPE', 'float64')
+OHLCV_DTYPES = {'Open': _PRICE_DTYPE, 'High': _PRICE_DTYPE, 'Low': _PRICE_DTYPE, 'Close': _PRICE_DTYPE, 'Volume': 'float64'}
+
+
+def _normalize_ohlcv(df: pd.DataFrame) -> pd.DataFrame:
+    """Title-case OHLCV column names, put them first (extra columns follow) and apply OHLCV_DTYPES."""
+    renames = {col: col.title() for col in df.columns if isinstance(col, str) and col.title() in OHLCV_DTYPES and col != col.title()}
+    if renames:
+        df = df.rename(columns=renames)
+    present = [col for col in OHLCV_COLUMNS if col in df.columns]
+    ordered = present + [col for col in df.columns if col not in OHLCV_DTYPES]
+    if list(df.columns) != ordered:
+        df = df[ordered]
+    casts = {col: OHLCV_DTYPES[col] for col in present if df[col].dtype != OHLCV_DTYPES[col]}
+    return df.astype(casts) if casts else df
+
+
+# lxml's C parser when installed, the pure-Python one otherwise
+HTML_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
+# Sources whose prices are compared against each other after a fetch
+_CROSS_CHECK_SOURCES = frozenset({'yahoo', 'polygon'})
+
+# Yahoo's JSON quote endpoint serves many symbols per request
+_YAHOO_QUOTE_URL = 'https://query1.finance.yahoo.com/v7/finance/quote'
+
+# Polygon aggregate bar keys (raw JSON) and the structured dtype they are packed into
+_POLYGON_BAR_FIELDS = itemgetter('t', 'o', 'h', 'l', 'c', 'v')
+_POLYGON_BAR_DTYPE = np.dtype([('ts', 'i8'), ('o', 'f8'), ('h', 'f8'), ('l', 'f8'), ('c', 'f8'), ('v', 'f8')])
+
+
+class LatestQuote(NamedTuple):
+    """A single scraped price; to_frame() wraps it in the 1-row OHLCV shape get_data returns."""
+    price: float
+    ts: pd.Timestamp
+
+    def to_frame(self) -> pd.DataFrame:
+        return _normalize_ohlcv(pd.DataFrame({
+            'Open': [self.price],
+            'High': [self.price],
+            'Low': [self.price],
+            'Close': [self.price],
+            'Volume': [0]
+        }, index=[self.ts]))
 
 
 class DataFetcher:
@@ -18,9 +90,22 @@ class DataFetcher:
     Adds structured logging and per-source metrics for retries, failures and successes.
     """
 
+    # Source name -> fetcher method taking (ticker, asset_type); exchange-backed sources all go through _fetch_crypto
+    _SOURCE_METHODS = {
+        'yahoo': '_fetch_yahoo',
+        'polygon': '_fetch_polygon',
+        'google_finance': '_fetch_google_finance',
+    }
+    _CRYPTO_SOURCES = frozenset({'crypto', 'coinbase', 'kucoin', 'kraken', 'bybit', 'gateio', 'mexc'})
+    # Sources that only know the latest price (a 1-row frame), not candle history; never raced
+    # against history sources, only tried once those have all failed
+    _QUOTE_ONLY_SOURCES = frozenset({'google_finance'})
+
     def __init__(self, config_path: str = "config/data_sources.json", output_manager=None):
         self.config = self._load_config(config_path)
         self.polygon_api_key = os.environ.get("POLYGON_API_KEY")
+        # One client for the fetcher's lifetime so its HTTP session (and connections) are reused
+        self.polygon_client = RESTClient(api_key=self.polygon_api_key) if self.polygon_api_key and RESTClient else None
 
         # Default network controls (seconds)
         self.default_timeout = int(os.environ.get('FETCH_TIMEOUT_SEC', '10'))
@@ -28,8 +113,29 @@ class DataFetcher:
         self.default_backoff = float(os.environ.get('FETCH_BACKOFF', '1.5'))
         # ccxt expects milliseconds
         self.default_timeout_ms = int(self.default_timeout * 1000)
+        # Sources are raced in priority order, each starting this long after the previous one
+        # unless that one already failed, so the preferred source usually wins
+        self.race_stagger = float(os.environ.get('FETCH_RACE_STAGGER_SEC', '0.2'))
+        # At most this many crypto exchanges are in a race at once; the next one starts when one fails
+        self.race_max_exchanges = max(1, int(os.environ.get('FETCH_RACE_MAX_EXCHANGES', '2')))
+        # Fetched frames are kept on disk for this long unless a source sets its own `cache_ttl_sec`
+        # (0 disables the cache); the oldest entries are evicted once the cache outgrows FETCH_CACHE_MAX_MB
+        self.cache_ttl = float(os.environ.get('FETCH_CACHE_TTL_SEC', '3600'))
+        self.file_cache = FileCache(os.environ.get('FETCH_CACHE_DIR', '.cache/ohlcv'),
+                                    max_bytes=int(float(os.environ.get('FETCH_CACHE_MAX_MB', '10240')) * 1024 * 1024))
+        # Shared worker pool for raced source fetches (see _race_sources)...
+        fetch_workers = int(os.environ.get('FETCH_WORKERS', '32'))
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=fetch_workers, thread_name_prefix='fetch')
+        # ...and a separate one for the timed calls they make (see _run_with_timeout), so a busy
+        # race pool can never starve the attempts its workers are waiting on
+        self._call_executor = concurrent.futures.ThreadPoolExecutor(max_workers=fetch_workers, thread_name_prefix='fetch-call')
         # Optional OutputManager for alerts
         self.output_manager = output_manager
+        # asset_type -> eligible sources in priority order
+        self._eligible_by_type: Dict[str, List[str]] = {}
+        # source -> (bound fetcher, timeout, retries, backoff)
+        self._plans: Dict[str, Tuple[Callable, int, int, float]] = {}
+        self.refresh_sources()
 
         # Initialize crypto exchanges if configured
         self.crypto_exchanges = {}
@@ -49,26 +155,68 @@ class DataFetcher:
                             except Exception:
                                 pass
                             self.crypto_exchanges[source] = ex
-                        logger.info(f"Initialized crypto exchange: {exchange_name} for source {source}")
+                        logger.info("Initialized crypto exchange: %s for source %s", exchange_name, source)
                     except Exception as e:
-                        logger.fail(f"Could not initialize crypto exchange '{exchange_name}': {e}")
+                        logger.fail("Could not initialize crypto exchange '%s': %s", exchange_name, e)
+
+        # Exchange market maps are reloaded at most this often
+        self.markets_ttl = float(os.environ.get('CRYPTO_MARKETS_TTL_SEC', '3600'))
+        self._markets_loaded_at: Dict[str, float] = {}
+        self._markets_lock = threading.Lock()
+        # Optionally load every exchange's markets up front and keep them fresh from a daemon thread,
+        # so crypto fetches never wait on the markets endpoint
+        if os.environ.get('CRYPTO_PREWARM_MARKETS', '0') == '1' and self.crypto_exchanges:
+            threading.Thread(target=self._refresh_markets_forever, name='markets-refresh', daemon=True).start()
+        # fetch_crypto_many runs on one persistent event loop (started on first use) with
+        # long-lived ccxt.async_support exchanges, so their connections are reused between calls
+        self.async_crypto_exchanges = {}
+        self._loop = None
+        self._loop_lock = threading.Lock()
+        # Concurrent fetch_ohlcv calls per exchange in fetch_crypto_many
+        self.crypto_concurrency = int(os.environ.get('CRYPTO_FETCH_CONCURRENCY', '10'))
 
         self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Connection': 'keep-alive'
         }
+        # Keep-alive session so repeated scrapes reuse TCP/TLS connections; retries are handled by
+        # _call_with_retries, so the adapter itself never retries
+        self._http = requests.Session()
+        self._http.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=Retry(total=0))
+        self._http.mount('https://', adapter)
+        self._http.mount('http://', adapter)
+
+    def close(self):
+        """Release pooled HTTP connections, async exchanges, the event loop and the fetch worker pools."""
+        self._http.close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._call_executor.shutdown(wait=False, cancel_futures=True)
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            async def close_exchanges():
+                for exchange in self.async_crypto_exchanges.values():
+                    await exchange.close()
+                self.async_crypto_exchanges.clear()
+
+            try:
+                asyncio.run_coroutine_threadsafe(close_exchanges(), loop).result(self.default_timeout)
+            except Exception as e:
+                logger.fail("Could not close async exchanges: %s", e)
+            loop.call_soon_threadsafe(loop.stop)
 
     def _load_config(self, path: str) -> Dict:
         """Load data sources configuration from JSON file."""
         try:
-            with open(path, 'r') as f:
-                config = json.load(f)
-                logger.info(f"Loaded data sources config: {len(config.get('data_sources',{}))} sources available")
-                return config
+            config = jsonutil.load_config(path)
+            logger.info("Loaded data sources config: %s sources available", len(config.get('data_sources',{})))
+            return config
         except FileNotFoundError:
-            logger.fail(f"Config file {path} not found. Using default configuration.")
+            logger.fail("Config file %s not found. Using default configuration.", path)
             return self._get_default_config()
-        except json.JSONDecodeError:
-            logger.fail(f"Invalid JSON in {path}. Using default configuration.")
+        except jsonutil.JSONDecodeError:
+            logger.fail("Invalid JSON in %s. Using default configuration.", path)
             return self._get_default_config()
 
     def _get_default_config(self) -> Dict:
@@ -90,87 +238,216 @@ class DataFetcher:
         if asset_type == 'crypto' and '-' not in ticker:
             ticker = f"{ticker}-USD"
 
-        logger.info(f"Fetching '{ticker}' from Yahoo Finance...")
+        logger.debug("Fetching '%s' from Yahoo Finance...", ticker)
         try:
             ticker_obj = yf.Ticker(ticker)
             hist = ticker_obj.history(period="90d", interval="1h")
             if hist is None or getattr(hist, 'empty', False):
-                logger.info(f"No data found for {ticker}")
+                logger.info("No data found for %s", ticker)
                 return None
-            logger.success(f"Successfully fetched {len(hist)} data points for {ticker}")
-            return hist
+            logger.success("Successfully fetched %s data points for %s", len(hist), ticker)
+            return _normalize_ohlcv(hist)
         except Exception as e:
-            logger.fail(f"Error fetching {ticker} from Yahoo: {e}")
+            logger.fail("Error fetching %s from Yahoo: %s", ticker, e)
             return None
 
     def _fetch_crypto(self, ticker: str, source: str) -> Optional[pd.DataFrame]:
         """Fetches data from the configured crypto exchange."""
         exchange = self.crypto_exchanges.get(source)
         if not exchange:
-            logger.fail(f"Crypto exchange for source '{source}' not available")
+            logger.fail("Crypto exchange for source '%s' not available", source)
             return None
 
-        logger.info(f"Fetching '{ticker}' from {exchange.name}...")
+        logger.debug("Fetching '%s' from %s...", ticker, exchange.name)
         try:
-            exchange.load_markets()
-            ohlcv = exchange.fetch_ohlcv(ticker, timeframe='1h', limit=500)
-            if not ohlcv:
-                alt_ticker = ticker.replace('/', '-')
-                logger.info(f"Ticker not found, trying alternative format: {alt_ticker}")
-                ohlcv = exchange.fetch_ohlcv(alt_ticker, timeframe='1h', limit=500)
+            symbol = self._resolve_symbol(ticker, self._ensure_markets(source, exchange))
+            if symbol is None:
+                logger.info("%s is not listed on %s", ticker, exchange.name)
+                return None
+            ohlcv = exchange.fetch_ohlcv(symbol, timeframe='1h', limit=500)
 
             if not ohlcv:
-                logger.info(f"No data found for {ticker} on {exchange.name}")
+                logger.info("No data found for %s on %s", ticker, exchange.name)
                 return None
 
-            df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
-            df.columns = ['Open', 'High', 'Low', 'Close', 'Volume']
-            logger.success(f"Successfully fetched {len(df)} data points from {exchange.name} for {ticker}")
+            df = self._ohlcv_frame(ohlcv)
+            logger.success("Successfully fetched %s data points from %s for %s", len(df), exchange.name, ticker)
+            return df
+        except Exception as e:
+            logger.fail("Error fetching %s from %s: %s", ticker, exchange.name, e)
+            return None
+
+    @staticmethod
+    def _resolve_symbol(ticker: str, markets: Dict) -> Optional[str]:
+        """Pick the listed spelling of a pair up front instead of retrying the request with another format."""
+        if not markets:
+            return ticker
+        return next((candidate for candidate in (ticker, ticker.replace('-', '/'), ticker.replace('/', '-')) if candidate in markets), None)
+
+    @staticmethod
+    def _ohlcv_frame(ohlcv: list) -> pd.DataFrame:
+        """ccxt candles -> OHLCV frame indexed by timestamp."""
+        # One typed array, then column views: no per-cell object conversion, relabel or set_index copy
+        arr = np.asarray(ohlcv, dtype=np.float64)
+        return _normalize_ohlcv(pd.DataFrame(
+            {'Open': arr[:, 1], 'High': arr[:, 2], 'Low': arr[:, 3], 'Close': arr[:, 4], 'Volume': arr[:, 5]},
+            index=pd.DatetimeIndex(pd.to_datetime(arr[:, 0].astype(np.int64), unit='ms'), name='timestamp')
+        ))
+
+    def fetch_crypto_many(self, tickers: List[str], source: str) -> Dict[str, Optional[pd.DataFrame]]:
+        """Fetch many pairs from one exchange concurrently (ccxt.async_support); sync entry point."""
+        if ccxt_async is None or source not in self.crypto_exchanges:
+            return {ticker: self._fetch_crypto(ticker, source) for ticker in tickers}
+        try:
+            return self._run_async(self._fetch_crypto_many_async(tickers, source),
+                                   timeout=self._batch_timeout(source, len(tickers)))
+        except concurrent.futures.TimeoutError:
+            logger.fail("Fetching %s pairs from %s timed out", len(tickers), source)
+            return {ticker: None for ticker in tickers}
+
+    def _batch_timeout(self, source: str, count: int) -> float:
+        """Upper bound for fetching `count` pairs from one exchange: the market load plus every
+        wave of crypto_concurrency fetches running out all of its attempts and backoffs."""
+        _, timeout, retries, backoff = self._source_plan(source)
+        per_ticker = timeout * (retries + 1) + sum(min(backoff * (2 ** attempt), 30) * 1.25 for attempt in range(retries))
+        waves = -(-count // max(1, self.crypto_concurrency))
+        return timeout + waves * per_ticker
+
+    def _run_async(self, coro, timeout: float = None):
+        """Run a coroutine on the fetcher's persistent event loop and wait for its result.
+
+        Raises concurrent.futures.TimeoutError after `timeout` seconds, cancelling the coroutine
+        so it can't keep the loop busy for later calls.
+        """
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name='fetch-loop', daemon=True).start()
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def _async_exchange(self, source: str):
+        """The ccxt.async_support twin of a configured exchange, created once and kept open
+        (its aiohttp session pools connections across calls). Only called on the event loop."""
+        exchange = self.async_crypto_exchanges.get(source)
+        if exchange is None:
+            sync_exchange = self.crypto_exchanges[source]
+            exchange = getattr(ccxt_async, sync_exchange.id)({'timeout': self.default_timeout_ms, 'enableRateLimit': True})
+            self.async_crypto_exchanges[source] = exchange
+        return exchange
+
+    async def _fetch_crypto_many_async(self, tickers: List[str], source: str) -> Dict[str, Optional[pd.DataFrame]]:
+        exchange = self._async_exchange(source)
+        # Reuse the market map the sync exchange already holds instead of loading it again
+        try:
+            markets = await asyncio.to_thread(self._ensure_markets, source, self.crypto_exchanges[source])
+        except Exception as e:
+            # As in _fetch_crypto: an outage means no frames, and callers fall back per ticker
+            logger.fail("Error loading markets from %s: %s", exchange.name, e)
+            return {ticker: None for ticker in tickers}
+        if exchange.markets is not markets:
+            exchange.set_markets(markets)
+        semaphore = asyncio.Semaphore(self.crypto_concurrency)
+
+        async def fetch_one(ticker: str) -> Optional[pd.DataFrame]:
+            async with semaphore:
+                return await self._fetch_crypto_async(exchange, source, ticker, markets)
+
+        frames = await asyncio.gather(*(fetch_one(ticker) for ticker in tickers))
+        return dict(zip(tickers, frames))
+
+    async def _fetch_crypto_async(self, exchange, source: str, ticker: str, markets: Dict) -> Optional[pd.DataFrame]:
+        """Async twin of _fetch_crypto for an already prepared ccxt.async_support exchange."""
+        logger.debug("Fetching '%s' from %s...", ticker, exchange.name)
+        try:
+            symbol = self._resolve_symbol(ticker, markets)
+            if symbol is None:
+                logger.info("%s is not listed on %s", ticker, exchange.name)
+                return None
+            _, timeout, retries, backoff = self._source_plan(source)
+            ohlcv = await self._call_with_retries_async(
+                lambda: exchange.fetch_ohlcv(symbol, timeframe='1h', limit=500),
+                timeout=timeout, retries=retries, backoff=backoff, metric_prefix=f"fetch.{source}")
+            if not ohlcv:
+                logger.info("No data found for %s on %s", ticker, exchange.name)
+                return None
+            df = self._ohlcv_frame(ohlcv)
+            logger.success("Successfully fetched %s data points from %s for %s", len(df), exchange.name, ticker)
             return df
         except Exception as e:
-            logger.fail(f"Error fetching {ticker} from {exchange.name}: {e}")
+            logger.fail("Error fetching %s from %s: %s", ticker, exchange.name, e)
             return None
 
+    def _ensure_markets(self, source: str, exchange) -> Dict:
+        """Return the exchange's market map, loading it only when missing or older than markets_ttl."""
+        with self._markets_lock:
+            loaded_at = self._markets_loaded_at.get(source)
+            if loaded_at is None or _time.monotonic() - loaded_at > self.markets_ttl or not getattr(exchange, 'markets', None):
+                exchange.load_markets(reload=loaded_at is not None)
+                self._markets_loaded_at[source] = _time.monotonic()
+        return exchange.markets or {}
+
+    def prewarm_markets(self):
+        """Load (or refresh, if older than markets_ttl) the market map of every configured exchange."""
+        for source, exchange in self.crypto_exchanges.items():
+            try:
+                self._ensure_markets(source, exchange)
+            except Exception as e:
+                logger.fail("Could not load markets for %s: %s", exchange.name, e)
+
+    def _refresh_markets_forever(self):
+        while True:
+            self.prewarm_markets()
+            _time.sleep(max(self.markets_ttl, 60))
+
     def _fetch_google_finance(self, ticker: str, asset_type: str) -> Optional[pd.DataFrame]:
         """Fetches data from Google Finance via web scraping."""
+        quote = self._scrape_google_quote(ticker, asset_type)
+        return quote.to_frame() if quote is not None else None
+
+    def _scrape_google_quote(self, ticker: str, asset_type: str) -> Optional['LatestQuote']:
+        """Scrape the current price from Google Finance without building a DataFrame."""
         if asset_type == 'forex':
             ticker = ticker.replace('/', '-')
 
-        logger.info(f"Fetching '{ticker}' from Google Finance...")
+        logger.debug("Fetching '%s' from Google Finance...", ticker)
         try:
             url = f"https://www.google.com/finance/quote/{ticker}"
-            response = requests.get(url, headers=self.headers, timeout=self.default_timeout)
+            response = self._http.get(url, timeout=self.default_timeout)
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-            price_element = soup.find('div', {'data-source': 'PRICE'})
-            if not price_element:
-                logger.info(f"Could not find price data for {ticker}")
+            # Scan the raw bytes for the price div; only build a parse tree when the text is nested deeper
+            match = _PRICE_RE.search(response.content)
+            price_text = match.group(1).decode('utf-8', 'replace') if match else None
+            if not price_text:
+                price_strainer = SoupStrainer('div', attrs={'data-source': 'PRICE'})
+                price_element = BeautifulSoup(response.content, HTML_PARSER, parse_only=price_strainer).find('div', {'data-source': 'PRICE'})
+                price_text = price_element.text if price_element else None
+            if not price_text:
+                logger.info("Could not find price data for %s", ticker)
                 return None
-            current_price = float(price_element.text.replace('$', '').replace(',', ''))
-            df = pd.DataFrame({
-                'Open': [current_price],
-                'High': [current_price],
-                'Low': [current_price],
-                'Close': [current_price],
-                'Volume': [0]
-            }, index=[pd.Timestamp.now()])
-            logger.success(f"Successfully fetched current price: ${current_price} for {ticker}")
-            return df
+            current_price = float(price_text.replace('$', '').replace(',', ''))
+            logger.success("Successfully fetched current price: $%s for %s", current_price, ticker)
+            return LatestQuote(current_price, pd.Timestamp.now())
         except Exception as e:
-            logger.fail(f"Error fetching {ticker} from Google Finance: {e}")
+            logger.fail("Error fetching %s from Google Finance: %s", ticker, e)
             return None
 
     def _run_with_timeout(self, func, timeout: int):
-        """Run func() with timeout (seconds). Returns result or raises TimeoutError."""
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(func)
-            try:
-                return future.result(timeout=timeout)
-            except concurrent.futures.TimeoutError:
-                future.cancel()
-                raise TimeoutError(f"Operation timed out after {timeout} seconds")
+        """Run func() with timeout (seconds). Returns result or raises TimeoutError.
+
+        Calls run on the fetcher's shared call pool, so no thread is created per call and a
+        timed-out call is abandoned instead of blocking the caller until it finishes.
+        """
+        future = self._call_executor.submit(func)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"Operation timed out after {timeout} seconds")
 
     def _call_with_retries(self, func_callable, timeout: int = None, retries: int = None, backoff: float = None, metric_prefix: str = None):
         """Call a callable with retries and exponential backoff. Returns result or raises last exception."""
@@ -188,14 +465,15 @@ class DataFetcher:
                 return self._run_with_timeout(func_callable, timeout)
             except Exception as e:
                 last_exc = e
+                if attempt == retries or not self._is_retryable(e):
+                    break
                 if metric_prefix:
                     try:
                         logger.increment_metric(f"{metric_prefix}.retry")
                     except Exception:
                         pass
-                wait = backoff * (2 ** attempt)
-                wait = min(wait, 30)
-                logger.info(f"Retry {attempt+1}/{retries} failed: {e}. Backing off {wait:.1f}s")
+                wait = self._backoff_delay(backoff, attempt)
+                logger.info("Retry %s/%s failed: %s. Backing off %.1fs", attempt+1, retries, e, wait)
                 _time.sleep(wait)
                 attempt += 1
                 continue
@@ -207,154 +485,473 @@ class DataFetcher:
                 pass
         raise last_exc
 
+    @staticmethod
+    def _backoff_delay(backoff: float, attempt: int) -> float:
+        """Capped exponential backoff plus up to 25% random jitter, so clients that failed together
+        don't all retry at the same instant."""
+        wait = min(backoff * (2 ** attempt), 30)
+        return wait + random.uniform(0, wait * 0.25)
+
+    @staticmethod
+    def _is_retryable(exc: Exception) -> bool:
+        """Client errors (HTTP 4xx other than 429, bad symbols, auth failures) fail the same way every time."""
+        response = getattr(exc, 'response', None)
+        status = getattr(response, 'status_code', None)
+        if isinstance(status, int) and 400 <= status < 500 and status != 429:
+            return False
+        return not isinstance(exc, (ccxt.BadRequest, ccxt.AuthenticationError, ccxt.PermissionDenied, ccxt.NotSupported))
+
+    async def _call_with_retries_async(self, coro_factory, timeout: int = None, retries: int = None, backoff: float = None, metric_prefix: str = None):
+        """Async _call_with_retries: asyncio.wait_for enforces the timeout and the backoff awaits
+        asyncio.sleep, so other fetches on the loop keep running meanwhile."""
+        if timeout is None:
+            timeout = self.default_timeout
+        if retries is None:
+            retries = self.default_retries
+        if backoff is None:
+            backoff = self.default_backoff
+
+        attempt = 0
+        last_exc = None
+        while attempt <= retries:
+            try:
+                return await asyncio.wait_for(coro_factory(), timeout)
+            except Exception as e:
+                last_exc = e
+                if attempt == retries or not self._is_retryable(e):
+                    break
+                if metric_prefix:
+                    logger.increment_metric(f"{metric_prefix}.retry")
+                wait = self._backoff_delay(backoff, attempt)
+                logger.info("Retry %s/%s failed: %s. Backing off %.1fs", attempt+1, retries, e, wait)
+                await asyncio.sleep(wait)
+                attempt += 1
+
+        if metric_prefix:
+            logger.increment_metric(f"{metric_prefix}.failure")
+        raise last_exc
+
     def _fetch_polygon(self, ticker: str, asset_type: str) -> Optional[pd.DataFrame]:
         """Fetches data from Polygon.io (requires API key)."""
         if asset_type == 'forex':
             ticker = f"C:{ticker.replace('/', '')}"
 
-        logger.info(f"Fetching '{ticker}' from Polygon.io...")
+        logger.debug("Fetching '%s' from Polygon.io...", ticker)
         if not self.polygon_api_key:
-            logger.info("Polygon API key not available, skipping")
+            logger.debug("Polygon API key not available, skipping")
+            return None
+
+        if self.polygon_client is None:
+            logger.fail("polygon-api-client is not installed, cannot fetch %s from Polygon.io", ticker)
             return None
 
         try:
-            from polygon import RESTClient
-            client = RESTClient(api_key=self.polygon_api_key)
-            from datetime import datetime, timedelta
-            end_date = datetime.now().date()
+            end_date = date.today()
             start_date = end_date - timedelta(days=90)
-            aggs = list(client.get_aggs(
+            # raw=True hands back the HTTP response so the body is parsed once with orjson into plain
+            # dicts, skipping the client's per-bar Agg model objects
+            response = self.polygon_client.get_aggs(
                 ticker=ticker,
                 multiplier=1,
                 timespan="day",
                 from_=start_date,
                 to=end_date,
-                limit=90
-            ))
+                limit=90,
+                raw=True
+            )
+            bars = jsonutil.loads(response.data).get('results') or []
 
-            if not aggs:
-                logger.info(f"No data found for {ticker}")
+            if not bars:
+                logger.info("No data found for %s", ticker)
                 return None
 
-            data = []
-            for agg in aggs:
-                data.append({
-                    'Date': datetime.fromtimestamp(agg.timestamp / 1000).date(),
-                    'Open': agg.open,
-                    'High': agg.high,
-                    'Low': agg.low,
-                    'Close': agg.close,
-                    'Volume': agg.volume
-                })
-
-            df = pd.DataFrame(data)
-            df.set_index('Date', inplace=True)
-            df.index = pd.to_datetime(df.index)
-            logger.success(f"Successfully fetched {len(df)} days of data from Polygon for {ticker}")
+            # Read only the fields we keep (t/o/h/l/c/v) straight into typed columns
+            rows = np.fromiter(map(_POLYGON_BAR_FIELDS, bars), dtype=_POLYGON_BAR_DTYPE, count=len(bars))
+            # Bars are keyed by their (local) calendar date, as datetime.fromtimestamp(...).date() would give
+            dates = pd.to_datetime(rows['ts'], unit='ms', utc=True).tz_convert(tzlocal()).tz_localize(None).normalize()
+            df = _normalize_ohlcv(pd.DataFrame(
+                {'Open': rows['o'], 'High': rows['h'], 'Low': rows['l'], 'Close': rows['c'], 'Volume': rows['v']},
+                index=dates.rename('Date')
+            ))
+            logger.success("Successfully fetched %s days of data from Polygon for %s", len(df), ticker)
             return df
         except Exception as e:
-            logger.fail(f"Error fetching {ticker} from Polygon.io: {e}")
+            logger.fail("Error fetching %s from Polygon.io: %s", ticker, e)
             return None
 
     def get_data(self, ticker: str, asset_type: str = 'stocks', preferred_sources: List[str] = None) -> Optional[pd.DataFrame]:
-        """Main method to fetch data using configurable sources with fallback strategy."""
-        if preferred_sources:
-            sources_to_try = preferred_sources
-        else:
-            sources_to_try = self.config.get('asset_type_mapping', {}).get(asset_type, self.config.get('priority_order', ['yahoo']))
-
-        logger.info(f"Trying sources for {asset_type} '{ticker}': {sources_to_try}")
+        """Main method to fetch data using configurable sources with fallback strategy.
+
+        Eligible history sources are raced with a short stagger in priority order; the first one
+        that returns data wins and the rest are cancelled. Quote-only sources (a single latest-price
+        row) are only tried, in order, once every history source has failed.
+        """
+        sources_to_try = preferred_sources or self._default_sources(asset_type)
+        logger.debug("Trying sources for %s '%s': %s", asset_type, ticker, sources_to_try)
+
+        eligible = self._eligible_sources(asset_type, preferred_sources)
+        history = [source for source in eligible if source not in self._QUOTE_ONLY_SOURCES]
+        quote_only = [source for source in eligible if source in self._QUOTE_ONLY_SOURCES]
+        for source in history:
+            cached = self._cached_frame(source, ticker, asset_type)
+            if cached is not None:
+                logger.success("Loaded '%s' from the %s cache", ticker, source)
+                logger.increment_metric(f"fetch.{source}.cache_hit")
+                return cached
+
+        if history:
+            # Yahoo and Polygon cross-check each other, so fetch both up front rather than
+            # fetching the second one only after the race is won
+            cross_checked = _CROSS_CHECK_SOURCES.intersection(history) if _CROSS_CHECK_SOURCES.issubset(sources_to_try) else ()
+            source, data, futures = self._race_sources(history, ticker, asset_type, start_now=cross_checked)
+            if data is not None:
+                self._cross_check_winner(ticker, asset_type, source, data, sources_to_try, futures)
+                return data
+
+        for source in quote_only:
+            data = self._cached_frame(source, ticker, asset_type)
+            if data is None:
+                try:
+                    data = self._fetch_source_with_retries(source, ticker, asset_type)
+                except Exception as e:
+                    logger.fail("Error with %s: %s", source, e)
+                    logger.increment_metric(f"fetch.{source}.exception")
+                    continue
+            if data is not None and not getattr(data, 'empty', False):
+                logger.success("Fell back to the latest %s quote for %s", source, ticker)
+                logger.increment_metric(f"fetch.{source}.success")
+                return data
 
-        for source in sources_to_try:
-            if source not in self.config['data_sources']:
-                logger.info(f"Source '{source}' not configured, skipping")
-                continue
+        logger.fail("Failed to fetch data for '%s' from all available sources", ticker)
+        return None
 
-            source_config = self.config['data_sources'][source]
-            if asset_type not in source_config.get('supported_assets', []):
-                logger.info(f"Source '{source}' doesn't support {asset_type}, skipping")
+    def get_many(self, tickers: List[str], asset_type: str = 'stocks') -> Dict[str, Optional[pd.DataFrame]]:
+        """Fetch several tickers of one asset type, downloading Yahoo data in a single batch.
+
+        Cached frames are used first. When Yahoo is the preferred eligible source, all remaining
+        tickers go out in one `yf.download` call; anything it can't serve falls back to `get_data`.
+        """
+        eligible = self._eligible_sources(asset_type)
+
+        results: Dict[str, Optional[pd.DataFrame]] = {}
+        remaining = []
+        for ticker in dict.fromkeys(tickers):
+            # Quote-only frames (one row) never stand in for history; get_data falls back to them
+            cached = next((frame for frame in (self._cached_frame(source, ticker, asset_type) for source in eligible
+                                               if source not in self._QUOTE_ONLY_SOURCES)
+                           if frame is not None), None)
+            if cached is not None:
+                results[ticker] = cached
+            else:
+                remaining.append(ticker)
+
+        if remaining and eligible and eligible[0] == 'yahoo':
+            for ticker, data in self._download_yahoo(remaining, asset_type).items():
+                results[ticker] = data
+                self._store_frame('yahoo', ticker, asset_type, data)
+            remaining = [ticker for ticker in remaining if ticker not in results]
+
+        # Pairs Yahoo couldn't serve fan out concurrently over the first eligible exchange
+        exchange_source = next((source for source in eligible if source in self.crypto_exchanges), None)
+        if remaining and asset_type == 'crypto' and exchange_source:
+            for ticker, data in self.fetch_crypto_many(remaining, exchange_source).items():
+                if data is not None and not data.empty:
+                    results[ticker] = data
+                    self._store_frame(exchange_source, ticker, asset_type, data)
+            remaining = [ticker for ticker in remaining if ticker not in results]
+
+        if remaining:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(16, len(remaining))) as executor:
+                fetched = executor.map(lambda t: self.get_data(t, asset_type=asset_type), remaining)
+                results.update(zip(remaining, fetched))
+        return results
+
+    def get_latest_prices(self, tickers: List[str], asset_type: str = 'stocks') -> Dict[str, Optional[pd.DataFrame]]:
+        """Latest price only, as a 1-row OHLCV frame per ticker.
+
+        All tickers are quoted in one Yahoo quote request; anything it can't serve falls back
+        to the last candle from `get_many`.
+        """
+        tickers = list(dict.fromkeys(tickers))
+        results: Dict[str, Optional[pd.DataFrame]] = {}
+        if 'yahoo' in self._eligible_sources(asset_type):
+            results.update(self._fetch_yahoo_quote_batch(tickers, asset_type))
+
+        remaining = [ticker for ticker in tickers if ticker not in results]
+        if remaining:
+            for ticker, data in self.get_many(remaining, asset_type=asset_type).items():
+                results[ticker] = data.iloc[-1:] if data is not None and not data.empty else None
+        return results
+
+    @staticmethod
+    def _yahoo_symbols(tickers: List[str], asset_type: str) -> Dict[str, str]:
+        """Yahoo symbol -> caller's ticker (crypto pairs become e.g. BTC-USD)."""
+        yahoo_tickers = {}
+        for ticker in tickers:
+            yahoo_ticker = ticker.replace('/', '-') if asset_type == 'crypto' else ticker
+            if asset_type == 'crypto' and '-' not in yahoo_ticker:
+                yahoo_ticker = f"{yahoo_ticker}-USD"
+            yahoo_tickers[yahoo_ticker] = ticker
+        return yahoo_tickers
+
+    def _fetch_yahoo_quote_batch(self, tickers: List[str], asset_type: str = 'stocks') -> Dict[str, pd.DataFrame]:
+        """One Yahoo v7 quote request for many tickers; returns a 1-row frame per quoted ticker."""
+        yahoo_tickers = self._yahoo_symbols(tickers, asset_type)
+        if not yahoo_tickers:
+            return {}
+
+        logger.debug("Fetching quotes for %d tickers from Yahoo Finance...", len(yahoo_tickers))
+        try:
+            response = self._http.get(_YAHOO_QUOTE_URL, params={'symbols': ','.join(yahoo_tickers)},
+                                      timeout=self.default_timeout)
+            response.raise_for_status()
+            quotes = (jsonutil.loads(response.content).get('quoteResponse') or {}).get('result') or []
+        except Exception as e:
+            logger.fail("Error fetching quotes from Yahoo: %s", e)
+            logger.increment_metric("fetch.yahoo_quote.exception")
+            return {}
+
+        frames = {}
+        for quote in quotes:
+            ticker = yahoo_tickers.get(quote.get('symbol'))
+            price = quote.get('regularMarketPrice')
+            if ticker is None or price is None:
                 continue
-
-            if source_config.get('api_key_required', False):
-                api_key_var = source_config.get('api_key_env_var')
-                if api_key_var and not os.environ.get(api_key_var):
-                    logger.info(f"Source '{source}' requires API key ({api_key_var}), skipping")
+            ts = quote.get('regularMarketTime')
+            index = [pd.Timestamp(ts, unit='s', tz='UTC') if ts else pd.Timestamp.now(tz='UTC')]
+            frames[ticker] = _normalize_ohlcv(pd.DataFrame({
+                'Open': [quote.get('regularMarketOpen', price)],
+                'High': [quote.get('regularMarketDayHigh', price)],
+                'Low': [quote.get('regularMarketDayLow', price)],
+                'Close': [price],
+                'Volume': [quote.get('regularMarketVolume', 0)],
+            }, index=index))
+        logger.increment_metric("fetch.yahoo_quote.success")
+        logger.debug("Quoted %d/%d tickers from Yahoo Finance", len(frames), len(yahoo_tickers))
+        return frames
+
+    def _download_yahoo(self, tickers: List[str], asset_type: str) -> Dict[str, pd.DataFrame]:
+        """One batched Yahoo request for many tickers; returns only the non-empty frames."""
+        yahoo_tickers = self._yahoo_symbols(tickers, asset_type)
+
+        logger.info("Batch fetching %s tickers from Yahoo Finance...", len(yahoo_tickers))
+        try:
+            data = yf.download(list(yahoo_tickers), period="90d", interval="1h", group_by='ticker',
+                               threads=True, progress=False, timeout=self.default_timeout)
+        except Exception as e:
+            logger.fail("Error batch fetching from Yahoo: %s", e)
+            logger.increment_metric("fetch.yahoo.exception")
+            return {}
+        if data is None or data.empty:
+            return {}
+
+        frames = {}
+        for yahoo_ticker, ticker in yahoo_tickers.items():
+            if isinstance(data.columns, pd.MultiIndex):
+                if yahoo_ticker not in data.columns.get_level_values(0):
                     continue
+                frame = data[yahoo_ticker]
+            elif len(yahoo_tickers) == 1:
+                frame = data
+            else:
+                continue
+            frame = frame.dropna(how='all')
+            if not frame.empty:
+                frames[ticker] = _normalize_ohlcv(frame)
+                logger.increment_metric("fetch.yahoo.success")
+        logger.success("Batch fetched %s/%s tickers from Yahoo Finance", len(frames), len(yahoo_tickers))
+        return frames
+
+    def _default_sources(self, asset_type: str) -> List[str]:
+        return self.config.get('asset_type_mapping', {}).get(asset_type, self.config.get('priority_order', ['yahoo']))
+
+    def _eligible_sources(self, asset_type: str, preferred_sources: List[str] = None) -> List[str]:
+        """Sources to try for an asset type, in priority order, with ineligible ones removed.
+
+        The default list per asset type is worked out once and memoized (config and API keys
+        don't change while running; call refresh_sources() if they do).
+        """
+        if preferred_sources:
+            return [source for source in preferred_sources if self._is_source_eligible(source, asset_type)]
+        eligible = self._eligible_by_type.get(asset_type)
+        if eligible is None:
+            eligible = [source for source in self._default_sources(asset_type) if self._is_source_eligible(source, asset_type)]
+            self._eligible_by_type[asset_type] = eligible
+        return eligible
+
+    def refresh_sources(self):
+        """Recompute the memoized eligible sources and fetch plans (e.g. after setting an API key)."""
+        self._eligible_by_type = {}
+        self._plans = {}
+        for asset_type in self.config.get('asset_type_mapping', {}):
+            self._eligible_sources(asset_type)
+
+    def _is_source_eligible(self, source: str, asset_type: str) -> bool:
+        """Whether a source is configured, supports the asset type and has its API key."""
+        if source not in self.config['data_sources']:
+            logger.debug("Source '%s' not configured, skipping", source)
+            return False
+
+        source_config = self.config['data_sources'][source]
+        if asset_type not in source_config.get('supported_assets', []):
+            logger.debug("Source '%s' doesn't support %s, skipping", source, asset_type)
+            return False
+
+        if source_config.get('api_key_required', False):
+            api_key_var = source_config.get('api_key_env_var')
+            if api_key_var and not os.environ.get(api_key_var):
+                logger.debug("Source '%s' requires API key (%s), skipping", source, api_key_var)
+                return False
+        return True
+
+    def _cache_key(self, source: str, ticker: str, asset_type: str) -> str:
+        # Bars only grow during the day, so entries also roll over at midnight
+        return f"{source}|{ticker}|{asset_type}|{date.today().isoformat()}"
+
+    def _source_cache_ttl(self, source: str) -> float:
+        """A source's `cache_ttl_sec` from config, else FETCH_CACHE_TTL_SEC; 0 when caching is disabled."""
+        if self.cache_ttl <= 0:
+            return 0.0
+        return float(self.config['data_sources'].get(source, {}).get('cache_ttl_sec', self.cache_ttl))
+
+    def _cached_frame(self, source: str, ticker: str, asset_type: str) -> Optional[pd.DataFrame]:
+        ttl = self._source_cache_ttl(source)
+        if ttl <= 0:
+            return None
+        return self.file_cache.get(source, ticker, self._cache_key(source, ticker, asset_type), ttl)
+
+    def _store_frame(self, source: str, ticker: str, asset_type: str, data: pd.DataFrame):
+        if self._source_cache_ttl(source) > 0:
+            self.file_cache.set(source, ticker, self._cache_key(source, ticker, asset_type), data)
+
+    def invalidate(self, ticker: str):
+        """Drops the cached frames of a ticker for every source."""
+        self.file_cache.invalidate(ticker)
+
+    def _fetch_source_with_retries(self, source: str, ticker: str, asset_type: str) -> Optional[pd.DataFrame]:
+        """Fetch from one source using its configured timeout/retries/backoff; raises on final failure.
+
+        Non-empty results are written to the disk cache.
+        """
+        fetch_ticker = ticker.replace('/', '-') if source == 'yahoo' and asset_type == 'crypto' else ticker
+        fetch, timeout, retries, backoff = self._source_plan(source)
+        data = self._call_with_retries(lambda: fetch(fetch_ticker, asset_type), timeout=timeout, retries=retries, backoff=backoff, metric_prefix=f"fetch.{source}")
+        if data is not None and not getattr(data, 'empty', False):
+            self._store_frame(source, ticker, asset_type, data)
+        return data
+
+    def _race_sources(self, sources: List[str], ticker: str, asset_type: str, start_now=()):
+        """Start sources one stagger apart (or as soon as the running ones have all failed) and
+        return (source, data, futures) for the first non-empty result, or (None, None, futures).
+
+        Sources in `start_now` are fetched from the outset but still only compete once the
+        stagger reaches them; `futures` maps every started source to its future, so callers can
+        use results that arrive after the race is decided. No more than `race_max_exchanges`
+        crypto exchanges run at once. Fetches run on the shared worker pool.
+        """
+        futures = {source: self._executor.submit(self._fetch_source_with_retries, source, ticker, asset_type)
+                   for source in sources if source in start_now}
+        pending = {}
+        next_idx = 0
+        next_start = _time.monotonic()
+
+        def exchange_capped():
+            """Whether the next source is an exchange that must wait for a running one to finish."""
+            return (next_idx < len(sources) and sources[next_idx] in self._CRYPTO_SOURCES
+                    and sum(source in self._CRYPTO_SOURCES for source in pending.values()) >= self.race_max_exchanges)
 
-            try:
-                fetch_ticker = ticker.replace('/', '-') if source == 'yahoo' and asset_type == 'crypto' else ticker
-                source_cfg = self.config['data_sources'].get(source, {})
-                timeout = int(source_cfg.get('timeout', self.default_timeout))
-                retries = int(source_cfg.get('retries', self.default_retries))
-                backoff = float(source_cfg.get('backoff', self.default_backoff))
-
-                metric_prefix = f"fetch.{source}"
-                try:
-                    data = self._call_with_retries(lambda: self._fetch_from_source(source, fetch_ticker, asset_type), timeout=timeout, retries=retries, backoff=backoff, metric_prefix=metric_prefix)
+        try:
+            while next_idx < len(sources) or pending:
+                now = _time.monotonic()
+                if next_idx < len(sources) and not exchange_capped() and (not pending or now >= next_start):
+                    source = sources[next_idx]
+                    if source not in futures:
+                        futures[source] = self._executor.submit(self._fetch_source_with_retries, source, ticker, asset_type)
+                    pending[futures[source]] = source
+                    next_idx += 1
+                    next_start = now + self.race_stagger
+
+                # A capped exchange waits for a running source to finish rather than for the stagger
+                wait_for = max(0.0, next_start - _time.monotonic()) if next_idx < len(sources) and not exchange_capped() else None
+                done, _ = concurrent.futures.wait(pending, timeout=wait_for, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    source = pending.pop(future)
+                    metric_prefix = f"fetch.{source}"
+                    try:
+                        data = future.result()
+                    except Exception as e:
+                        logger.fail("Error with %s: %s", source, e)
+                        logger.increment_metric(f"{metric_prefix}.exception")
+                        continue
                     if data is not None and not getattr(data, 'empty', False):
-                        logger.success(f"Successfully fetched from {source}")
+                        logger.success("Successfully fetched from %s", source)
                         logger.increment_metric(f"{metric_prefix}.success")
+                        return source, data, futures
+                    logger.fail("No data returned from %s", source)
+                    logger.increment_metric(f"{metric_prefix}.no_data")
+            return None, None, futures
+        finally:
+            # Losing sources are abandoned: queued ones are cancelled, running ones finish in the
+            # background; sources fetched for the cross-check are left to complete
+            for source, future in futures.items():
+                if source not in start_now:
+                    future.cancel()
+
+    def _cross_check_winner(self, ticker: str, asset_type: str, source: str, data: pd.DataFrame,
+                            sources_to_try: List[str], futures: Dict = None):
+        """Price cross-check: compare yahoo vs polygon when both are candidate sources.
+
+        The other source's result is taken from `futures` when it was already fetched alongside
+        the race; only otherwise is it fetched now.
+        """
+        try:
+            threshold_pct = float(os.environ.get('PRICE_MISMATCH_THRESHOLD_PCT', '10'))
+        except Exception:
+            threshold_pct = 10.0
 
-                        # Price cross-check: compare yahoo vs polygon when both present
-                        try:
-                            threshold_pct = float(os.environ.get('PRICE_MISMATCH_THRESHOLD_PCT', '10'))
-                        except Exception:
-                            threshold_pct = 10.0
-
-                        other_source = None
-                        if source == 'yahoo' and 'polygon' in sources_to_try:
-                            other_source = 'polygon'
-                        elif source == 'polygon' and 'yahoo' in sources_to_try:
-                            other_source = 'yahoo'
+        other_source = None
+        if source == 'yahoo' and 'polygon' in sources_to_try:
+            other_source = 'polygon'
+        elif source == 'polygon' and 'yahoo' in sources_to_try:
+            other_source = 'yahoo'
 
-                        if other_source:
-                            try:
-                                other_cfg = self.config['data_sources'].get(other_source, {})
-                                other_timeout = int(other_cfg.get('timeout', self.default_timeout))
-                                other_retries = int(other_cfg.get('retries', self.default_retries))
-                                other_backoff = float(other_cfg.get('backoff', self.default_backoff))
-
-                                other_data = self._call_with_retries(lambda: self._fetch_from_source(other_source, fetch_ticker, asset_type), timeout=other_timeout, retries=other_retries, backoff=other_backoff, metric_prefix=f"fetch.{other_source}")
-                                if other_data is not None and not getattr(other_data, 'empty', False):
-                                    self._maybe_cross_check_prices(ticker, source, data, other_source, other_data, threshold_pct)
-                            except Exception as e:
-                                logger.info(f"Note: could not fetch {other_source} for cross-check: {e}")
-
-                        return data
-                    else:
-                        logger.fail(f"No data returned from {source}")
-                        logger.increment_metric(f"{metric_prefix}.no_data")
-                except Exception as e:
-                    logger.fail(f"Error with {source}: {e}")
-                    logger.increment_metric(f"{metric_prefix}.exception")
-                    continue
+        if other_source:
+            try:
+                if futures and other_source in futures:
+                    other_data = futures[other_source].result()
+                else:
+                    other_data = self._fetch_source_with_retries(other_source, ticker, asset_type)
+                if other_data is not None and not getattr(other_data, 'empty', False):
+                    self._maybe_cross_check_prices(ticker, source, data, other_source, other_data, threshold_pct)
             except Exception as e:
-                logger.fail(f"Unexpected error iterating sources: {e}")
-                continue
-
-        logger.fail(f"Failed to fetch data for '{ticker}' from all available sources")
-        return None
+                logger.info("Note: could not fetch %s for cross-check: %s", other_source, e)
+
+    def _source_plan(self, source: str) -> Tuple[Callable, int, int, float]:
+        """(fetch(ticker, asset_type), timeout, retries, backoff) for a source, resolved once."""
+        plan = self._plans.get(source)
+        if plan is None:
+            source_cfg = self.config['data_sources'].get(source, {})
+            if source in self._CRYPTO_SOURCES:
+                fetch = lambda ticker, asset_type: self._fetch_crypto(ticker, source)
+            elif source in self._SOURCE_METHODS:
+                fetch = getattr(self, self._SOURCE_METHODS[source])
+            else:
+                fetch = lambda ticker, asset_type: self._fetch_from_source(source, ticker, asset_type)
+            plan = (fetch,
+                    int(source_cfg.get('timeout', self.default_timeout)),
+                    int(source_cfg.get('retries', self.default_retries)),
+                    float(source_cfg.get('backoff', self.default_backoff)))
+            self._plans[source] = plan
+        return plan
 
     def _fetch_from_source(self, source: str, ticker: str, asset_type: str) -> Optional[pd.DataFrame]:
         """Route to the appropriate fetcher method based on source name."""
-        source_methods = {
-            'yahoo': lambda t: self._fetch_yahoo(t, asset_type), # Pass asset_type here
-            'polygon': lambda t: self._fetch_polygon(t, asset_type),
-            'crypto': lambda t: self._fetch_crypto(t, source),
-            'google_finance': lambda t: self._fetch_google_finance(t, asset_type),
-            'coinbase': lambda t: self._fetch_crypto(t, source),
-            'kucoin': lambda t: self._fetch_crypto(t, source),
-            'kraken': lambda t: self._fetch_crypto(t, source),
-            'bybit': lambda t: self._fetch_crypto(t, source),
-            'gateio': lambda t: self._fetch_crypto(t, source),
-            'mexc': lambda t: self._fetch_crypto(t, source)
-        }
-
-        method = source_methods.get(source)
-        if not method:
+        if source in self._CRYPTO_SOURCES:
+            return self._fetch_crypto(ticker, source)
+        method_name = self._SOURCE_METHODS.get(source)
+        if not method_name:
             raise ValueError(f"No fetch method implemented for source: {source}")
-
-        return method(ticker)
+        return getattr(self, method_name)(ticker, asset_type)
 
     def _maybe_cross_check_prices(self, ticker: str, src_a: str, data_a: pd.DataFrame, src_b: str, data_b: pd.DataFrame, threshold_pct: float):
         """Compare latest close prices between two dataframes and alert if difference > threshold_pct."""
@@ -362,8 +959,9 @@ class DataFetcher:
             def latest_close(df: pd.DataFrame):
                 if df is None or df.empty:
                     return None
+                # Fetchers normalize to 'Close', so the column scan only runs for foreign frames
                 col = 'Close' if 'Close' in df.columns else next((c for c in df.columns if c.lower().startswith('close')), df.columns[-1])
-                return float(df[col].iloc[-1])
+                return float(df[col].iat[-1])
 
             price_a = latest_close(data_a)
             price_b = latest_close(data_b)
@@ -373,7 +971,7 @@ class DataFetcher:
             diff_pct = abs(price_a - price_b) / max((price_a + price_b) / 2.0, 1e-9) * 100.0
             if diff_pct >= threshold_pct:
                 msg = f"Price mismatch for {ticker}: {src_a}={price_a} vs {src_b}={price_b} ({diff_pct:.1f}% diff)"
-                logger.fail(f"WARNING: {msg}")
+                logger.fail("WARNING: %s", msg)
                 try:
                     if self.output_manager:
                         alert = {
@@ -389,8 +987,8 @@ class DataFetcher:
                         try:
                             self.output_manager.write_price_alert(alert)
                         except Exception as e:
-                            logger.fail(f"Could not write price alert to sheets: {e}")
+                            logger.fail("Could not write price alert to sheets: %s", e)
                 except Exception:
                     pass
         except Exception as e:
-            logger.fail(f"Error during price cross-check: {e}")
\ No newline at end of file
+            logger.fail("Error during price cross-check: %s", e)
\ No newline at end of file
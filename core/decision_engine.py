@@ -1,6 +1,69 @@
-import json
+import numpy as np
+from utils import jsonutil
 from .trade_calculator import TradeCalculator 
 
+# (strategy, signal, reasoning) per outcome; a None reasoning names the catalyst instead
+STRATEGY_OUTCOMES = (
+    ("Short / Avoid", "Avoid", "High trap risk detected"),
+    ("Boost", "Buy", None),
+    ("Boost", "Sell", None),
+    ("Zen", "Buy", "Strong technical and macro confirmation"),
+    ("Neutral", "Hold", "Weak technical and macro scores"),
+    ("Caution", "Hold", "High retail sentiment with moderate trap risk"),
+    ("Neutral", "Hold", "No clear signal"),
+)
+MAJOR_CATALYSTS = ("fed", "earnings", "cpi", "jobs")
+
+# Every rule compares a score against a fixed cut, so each score only matters through the
+# bucket it falls in (the number of `>=` cuts it reaches; sentiment uses a strict `> 8`)
+_TECH_CUTS = np.array([5, 6, 8])
+_MACRO_CUTS = np.array([5, 6])
+_ZS10_CUTS = np.array([4, 5, 7])
+_SENTIMENT_CUT = 8
+
+
+def _strategy_outcome(tech: float, macro: float, zs10: float, sentiment: float, major_catalyst: bool) -> int:
+    """The strategy rules, first match wins; returns an index into STRATEGY_OUTCOMES."""
+    if zs10 >= 7:
+        return 0
+    if major_catalyst and zs10 < 5:
+        return 1 if tech >= 6 else 2
+    if tech >= 8 and macro >= 6 and zs10 < 4:
+        return 3
+    if tech < 5 and macro < 5:
+        return 4
+    if sentiment > 8 and 4 <= zs10 < 7:
+        return 5
+    return 6
+
+
+def _build_strategy_lut() -> np.ndarray:
+    """Evaluates the rules once per bucket combination: lut[tech, macro, zs10, sentiment, catalyst] -> outcome."""
+    def representatives(cuts):
+        return [cuts[0] - 1, *cuts]
+
+    lut = np.empty((len(_TECH_CUTS) + 1, len(_MACRO_CUTS) + 1, len(_ZS10_CUTS) + 1, 2, 2), dtype=np.int8)
+    for index in np.ndindex(lut.shape):
+        t, m, z, sent, cat = index
+        lut[index] = _strategy_outcome(representatives(_TECH_CUTS)[t], representatives(_MACRO_CUTS)[m],
+                                       representatives(_ZS10_CUTS)[z], _SENTIMENT_CUT + sent, bool(cat))
+    return lut
+
+
+_STRATEGY_LUT = _build_strategy_lut()
+
+
+def _strategy_codes(tech, macro, zs10, sentiment, major_catalyst) -> np.ndarray:
+    """Outcome index per asset (scalars or arrays) via bucketing and one table lookup."""
+    return _STRATEGY_LUT[
+        np.searchsorted(_TECH_CUTS, tech, side='right'),
+        np.searchsorted(_MACRO_CUTS, macro, side='right'),
+        np.searchsorted(_ZS10_CUTS, zs10, side='right'),
+        np.greater(sentiment, _SENTIMENT_CUT).astype(np.intp),
+        np.asarray(major_catalyst, dtype=np.intp),
+    ]
+
+
 class DecisionEngine:
     """
     Applies the final strategy mapping and confirmation logic to scored assets.
@@ -11,14 +74,25 @@ class DecisionEngine:
         """
         self.metrics = self._load_metrics(metrics_path)
         self.trade_calculator = TradeCalculator()
+        self._bind_rules()
+
+    def _bind_rules(self):
+        """Resolves the confirmation thresholds once; they never change during a run."""
+        confirmation = self.metrics.get('jmoney_confirmation')
+        self._has_confirmation = confirmation is not None
+        rules = confirmation['rules'] if confirmation else {}
+        self._required_conditions = confirmation.get('required_conditions', 99) if confirmation else 99
+        self._tech_thr = rules.get('technical_score', 99)
+        self._macro_thr = rules.get('macro_score', 99)
+        self._zs10_max = rules.get('zs10_score_max', 0)
+        self._catalyst_required = rules.get('catalyst_required', False)
 
     def _load_metrics(self, path: str) -> dict:
         """Loads scoring metrics from a JSON file."""
         print(f"Loading scoring metrics from: {path}")
         try:
-            with open(path, 'r') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
+            return jsonutil.load_config(path)
+        except (FileNotFoundError, jsonutil.JSONDecodeError):
             print(f"Error: The metrics file was not found at '{path}'")
             return {}
 
@@ -51,79 +125,138 @@ class DecisionEngine:
         
         return final_signals
     
+    def run_engine_vectorized(self, scored_assets: list[dict]) -> list[dict]:
+        """
+        Same output as run_engine, but strategy mapping (a strategy-table lookup), confidence and
+        confirmation (NumPy masks) are computed for the whole batch at once.
+        """
+        if not scored_assets:
+            return []
+
+        def scores(key: str, default: float) -> np.ndarray:
+            return np.fromiter((asset.get(key, default) for asset in scored_assets), dtype=float, count=len(scored_assets))
+
+        catalysts = [asset.get('catalyst_type', "None") for asset in scored_assets]
+
+        # Strategy mapping (defaults as in _map_strategy) as one table lookup per asset
+        major_catalyst = np.fromiter((c.lower() in MAJOR_CATALYSTS for c in catalysts), dtype=bool, count=len(catalysts))
+        codes = _strategy_codes(scores('technical_score', 5), scores('macro_score', 5), scores('zs10_score', 5),
+                                scores('sentiment_score', 5), major_catalyst)
+
+        # Confidence (note the different defaults)
+        confidence = scores('technical_score', 0) * 0.4 + scores('macro_score', 0) * 0.4 + (10 - scores('zs10_score', 5)) * 0.2
+
+        for i, asset in enumerate(scored_assets):
+            strategy, signal, reasoning = STRATEGY_OUTCOMES[codes[i]]
+            asset['strategy'], asset['signal'] = strategy, signal
+            asset['reasoning'] = reasoning or f"Catalyst detected: {catalysts[i]}"
+            asset['confidence_score'] = round(float(confidence[i]), 1)
+            asset.update(self.trade_calculator.calculate_trade_parameters(
+                market_data=asset.get('market_data'),
+                signal=asset['signal'],
+                confidence_score=asset['confidence_score']
+            ))
+
+        self._confirm_batch(scored_assets, catalysts)
+        return scored_assets
+
+    def _confirm_batch(self, assets: list[dict], catalysts: list):
+        """Vectorized _check_jmoney_confirmation over a batch."""
+        if not self._has_confirmation:
+            for asset in assets:
+                asset['jmoney_confirmed'] = False
+                asset['confirmation_reason'] = "No confirmation rules configured"
+            return
+        min_tech_score, min_macro_score, max_zs10_score = self._tech_thr, self._macro_thr, self._zs10_max
+
+        tech = np.fromiter((a.get('technical_score', 0) for a in assets), dtype=float, count=len(assets))
+        macro = np.fromiter((a.get('macro_score', 0) for a in assets), dtype=float, count=len(assets))
+        zs10 = np.fromiter((a.get('zs10_score', 10) for a in assets), dtype=float, count=len(assets))
+        checks = np.column_stack([
+            tech >= min_tech_score,
+            macro >= min_macro_score,
+            zs10 < max_zs10_score,
+            np.fromiter((c.lower() != "none" for c in catalysts), dtype=bool, count=len(assets)),
+        ])
+        if not self._catalyst_required:
+            checks = checks[:, :3]
+        confirmed = checks.sum(axis=1) >= self._required_conditions
+
+        # Reason strings use the raw values, formatted exactly as in _check_jmoney_confirmation
+        met_text = (
+            lambda a: f"Tech score: {a.get('technical_score', 0)}/10",
+            lambda a: f"Macro score: {a.get('macro_score', 0)}/10",
+            lambda a: f"Low trap risk: {a.get('zs10_score', 10)}/10",
+            lambda a: f"Catalyst: {a.get('catalyst_type')}",
+        )
+        failed_text = (
+            lambda a: f"Tech score low: {a.get('technical_score', 0)} (need ≥{min_tech_score})",
+            lambda a: f"Macro score low: {a.get('macro_score', 0)} (need ≥{min_macro_score})",
+            lambda a: f"High trap risk: {a.get('zs10_score', 10)} (need <{max_zs10_score})",
+            lambda a: "Catalyst required but not found",
+        )
+        for i, asset in enumerate(assets):
+            asset['jmoney_confirmed'] = bool(confirmed[i])
+            if confirmed[i]:
+                met_reasons = [met_text[k](asset) for k in np.flatnonzero(checks[i])[:2]]
+                asset['confirmation_reason'] = f"{asset.get('strategy', 'Unknown')}: {', '.join(met_reasons)}"
+            else:
+                failed = np.flatnonzero(~checks[i])
+                asset['confirmation_reason'] = f"Failed: {failed_text[failed[0]](asset) if failed.size else 'Criteria not met'}"
+
     # _map_strategy and _check_jmoney_confirmation methods remain the same
     def _map_strategy(self, asset: dict) -> dict:
-        tech_score = asset.get('technical_score', 5)
-        macro_score = asset.get('macro_score', 5)
-        zs10_score = asset.get('zs10_score', 5)
         catalyst = asset.get('catalyst_type', "None")
-        sentiment_score = asset.get('sentiment_score', 5)
-        strategy = "Neutral"
-        signal = "Hold"
-        reasoning = []
-        if zs10_score >= 7:
-            strategy, signal = "Short / Avoid", "Avoid"
-            reasoning.append("High trap risk detected")
-        elif catalyst.lower() in ["fed", "earnings", "cpi", "jobs"] and zs10_score < 5:
-            strategy, signal = "Boost", "Buy" if tech_score >= 6 else "Sell"
-            reasoning.append(f"Catalyst detected: {catalyst}")
-        elif tech_score >= 8 and macro_score >= 6 and zs10_score < 4:
-            strategy, signal = "Zen", "Buy" if tech_score >= 8 else "Sell"
-            reasoning.append("Strong technical and macro confirmation")
-        elif tech_score < 5 and macro_score < 5:
-            strategy, signal = "Neutral", "Hold"
-            reasoning.append("Weak technical and macro scores")
-        elif sentiment_score > 8 and 4 <= zs10_score < 7:
-            strategy, signal = "Caution", "Hold"
-            reasoning.append("High retail sentiment with moderate trap risk")
-        else:
-            reasoning.append("No clear signal")
-        asset['strategy'], asset['signal'], asset['reasoning'] = strategy, signal, "; ".join(reasoning)
+        code = _strategy_codes(
+            asset.get('technical_score', 5),
+            asset.get('macro_score', 5),
+            asset.get('zs10_score', 5),
+            asset.get('sentiment_score', 5),
+            catalyst.lower() in MAJOR_CATALYSTS,
+        )
+        strategy, signal, reasoning = STRATEGY_OUTCOMES[code]
+        asset['strategy'], asset['signal'], asset['reasoning'] = strategy, signal, reasoning or f"Catalyst detected: {catalyst}"
         return asset
 
     def _check_jmoney_confirmation(self, asset: dict) -> dict:
-        # This function remains unchanged from the previous update
-        # It correctly reads from config files
-        if "jmoney_confirmation" not in self.metrics:
+        if not self._has_confirmation:
             asset['jmoney_confirmed'] = False
             asset['confirmation_reason'] = "No confirmation rules configured"
             return asset
-        rules = self.metrics['jmoney_confirmation']['rules']
-        required_conditions = self.metrics['jmoney_confirmation'].get('required_conditions', 99)
         conditions_met, failed_reasons, met_reasons = 0, [], []
+        tech_score = asset.get('technical_score', 0)
+        macro_score = asset.get('macro_score', 0)
+        zs10_score = asset.get('zs10_score', 10)
         
-        min_tech_score = rules.get('technical_score', 99)
-        if asset.get('technical_score', 0) >= min_tech_score:
+        if tech_score >= self._tech_thr:
             conditions_met += 1
-            met_reasons.append(f"Tech score: {asset.get('technical_score', 0)}/10")
+            met_reasons.append(f"Tech score: {tech_score}/10")
         else:
-            failed_reasons.append(f"Tech score low: {asset.get('technical_score', 0)} (need ≥{min_tech_score})")
+            failed_reasons.append(f"Tech score low: {tech_score} (need ≥{self._tech_thr})")
         
-        min_macro_score = rules.get('macro_score', 99)
-        if asset.get('macro_score', 0) >= min_macro_score:
+        if macro_score >= self._macro_thr:
             conditions_met += 1
-            met_reasons.append(f"Macro score: {asset.get('macro_score', 0)}/10")
+            met_reasons.append(f"Macro score: {macro_score}/10")
         else:
-            failed_reasons.append(f"Macro score low: {asset.get('macro_score', 0)} (need ≥{min_macro_score})")
+            failed_reasons.append(f"Macro score low: {macro_score} (need ≥{self._macro_thr})")
 
-        max_zs10_score = rules.get('zs10_score_max', 0)
-        if asset.get('zs10_score', 10) < max_zs10_score:
+        if zs10_score < self._zs10_max:
             conditions_met += 1
-            met_reasons.append(f"Low trap risk: {asset.get('zs10_score', 10)}/10")
+            met_reasons.append(f"Low trap risk: {zs10_score}/10")
         else:
-            failed_reasons.append(f"High trap risk: {asset.get('zs10_score', 10)} (need <{max_zs10_score})")
+            failed_reasons.append(f"High trap risk: {zs10_score} (need <{self._zs10_max})")
             
-        if rules.get('catalyst_required', False):
+        if self._catalyst_required:
             if asset.get('catalyst_type', "None").lower() != "none":
                 conditions_met += 1
                 met_reasons.append(f"Catalyst: {asset.get('catalyst_type')}")
             else:
                 failed_reasons.append("Catalyst required but not found")
 
-        is_confirmed = conditions_met >= required_conditions
+        is_confirmed = conditions_met >= self._required_conditions
         asset['jmoney_confirmed'] = is_confirmed
         if is_confirmed:
             asset['confirmation_reason'] = f"{asset.get('strategy', 'Unknown')}: {', '.join(met_reasons[:2])}"
         else:
             asset['confirmation_reason'] = f"Failed: {failed_reasons[0] if failed_reasons else 'Criteria not met'}"
-        return asset
\ No newline at end of file
+        return asset
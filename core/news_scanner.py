@@ -1,6 +1,14 @@
-import json
+import concurrent.futures
+import importlib.util
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+from utils import jsonutil
+
+# lxml's C parser when installed, the pure-Python one otherwise
+HTML_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
 
 class NewsScanner:
     """
@@ -15,22 +23,63 @@ class NewsScanner:
         """
         self.sources = self._load_sources(sources_path)
         self.scrape_headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Connection': 'keep-alive'
         }
+        # One pooled session so repeated scans reuse connections to the same sites
+        self.session = requests.Session()
+        self.session.headers.update(self.scrape_headers)
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=Retry(total=0))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def close(self):
+        """Closes the pooled HTTP session."""
+        self.session.close()
 
     def _load_sources(self, path: str) -> dict:
         """Loads news sources from a JSON file."""
         print(f"Loading news sources from: {path}")
         try:
-            with open(path, 'r') as f:
-                return json.load(f)
+            return jsonutil.load_config(path)
         except FileNotFoundError:
             print(f"Error: The sources file was not found at '{path}'")
             return {}
-        except json.JSONDecodeError:
+        except jsonutil.JSONDecodeError:
             print(f"Error: Could not decode the JSON from '{path}'")
             return {}
 
+    def _scan_one_source(self, item: tuple) -> tuple:
+        """Scrapes one (source_name, url) pair. Returns (source_name, headlines), or (source_name, None) on failure."""
+        source_name, url = item
+        print(f"--> Scanning {source_name}...")
+        try:
+            response = self.session.get(url, timeout=15)
+            response.raise_for_status()  # Checks for HTTP errors
+
+            # Only <a> tags are needed, so the tree is built for those alone
+            soup = BeautifulSoup(response.content, HTML_PARSER, parse_only=SoupStrainer('a'))
+            
+            # One stripped get_text per anchor; long link texts are the headlines. Stop at the
+            # first 10 distinct ones instead of collecting every anchor on the page
+            seen, headlines = set(), []
+            for a in soup.find_all('a'):
+                text = a.get_text(strip=True)
+                if len(text) > 40 and text not in seen:
+                    seen.add(text)
+                    headlines.append(text)
+                    if len(headlines) == 10:
+                        break
+            
+            print(f"    ...found {len(headlines)} headlines from {source_name}.")
+            return source_name, headlines
+
+        except requests.RequestException as e:
+            print(f"    [FAILED] Could not fetch {url}. Error: {e}")
+        except Exception as e:
+            print(f"    [FAILED] An error occurred while parsing {source_name}: {e}")
+        return source_name, None
+
     def scan_headlines(self) -> dict:
         """
         Scans all configured sources and returns the headlines.
@@ -44,29 +93,13 @@ class NewsScanner:
             print("No sources loaded, cannot scan for headlines.")
             return all_headlines
 
-        for source_name, url in self.sources.items():
-            print(f"--> Scanning {source_name}...")
-            try:
-                response = requests.get(url, headers=self.scrape_headers, timeout=15)
-                response.raise_for_status()  # Checks for HTTP errors
-
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                headlines = [
-                    a.get_text(strip=True) for a in soup.find_all('a') 
-                    if a.get_text() and len(a.get_text(strip=True)) > 40
-                ]
-                
-                unique_headlines = list(dict.fromkeys(headlines))
-                all_headlines[source_name] = unique_headlines[:10]
-                print(f"    ...found {len(unique_headlines[:10])} headlines.")
-
-            except requests.RequestException as e:
-                print(f"    [FAILED] Could not fetch {url}. Error: {e}")
-                failed_sources.append(source_name)
-            except Exception as e:
-                print(f"    [FAILED] An error occurred while parsing {source_name}: {e}")
-                failed_sources.append(source_name)
+        # Sources are independent, so fetch them all at once; wall time is the slowest source, not the sum
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(32, len(self.sources))) as executor:
+            for source_name, headlines in executor.map(self._scan_one_source, self.sources.items()):
+                if headlines is None:
+                    failed_sources.append(source_name)
+                else:
+                    all_headlines[source_name] = headlines
         
         if failed_sources:
             print("\n--------------------------------------------------")
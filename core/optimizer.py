@@ -1,10 +1,63 @@
+import hashlib
 import json
+import os
 import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from .backtester import Backtester
 from .output_manager import OutputManager
-from .decision_engine import DecisionEngine
 from .ai_analyzer import AIAnalyzer
+from utils import jsonutil
+
+# Prompts for the AI's parameter suggestions; only the last run's numbers change between calls
+_SUGGEST_SYSTEM_MESSAGE = (
+    "You are a quantitative analyst. Your task is to suggest new parameters "
+    "to improve a trading strategy's backtested performance. "
+    "Respond with only a valid JSON object."
+)
+_SUGGEST_USER_TEMPLATE = (
+    "Current strategy parameters:\n"
+    "- technical_score: {technical_score}\n"
+    "- macro_score: {macro_score}\n"
+    "This resulted in a win_rate of: {win_rate:.2f}%\n\n"
+    "Suggest a new set of parameters to improve the win_rate. "
+    "Parameter Ranges:\n"
+    "- 'technical_score' must be between 6.0 and 9.5.\n"
+    "- 'macro_score' must be between 5.0 and 8.5."
+)
+
+
+def _sheet_score(value) -> float:
+    """Parses a score as written to the sheet ('7/10', or a bare number); NaN if missing."""
+    try:
+        return float(str(value).split('/')[0])
+    except ValueError:
+        return float('nan')
+
+
+class _TokenBucket:
+    """Thread-safe token bucket: `rate_per_min` calls a minute on average, bursts of up to `burst`."""
+    def __init__(self, rate_per_min: float, burst: int):
+        self.rate = rate_per_min / 60.0
+        self.capacity = max(1.0, float(burst))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
 
 class Optimizer:
     """
@@ -15,32 +68,185 @@ class Optimizer:
         self.backtester = Backtester(output_manager)
         self.metrics_path = metrics_path
         self.ai_analyzer = ai_analyzer
+        # Candidate rules are scored concurrently against trades simulated once up front; results
+        # are memoized per rule set
+        self.max_workers = int(os.getenv("OPTIMIZER_WORKERS", "4"))
+        # Concurrent AI lookups while enriching signals (I/O bound, so more than the CPU count)
+        self.ai_workers = int(os.getenv("OPTIMIZER_AI_WORKERS", "16"))
+        # ...paced by a token bucket rather than a fixed sleep per signal, to stay under provider limits
+        self.ai_rate = _TokenBucket(float(os.getenv("OPTIMIZER_AI_RATE_PER_MIN", "60")), self.ai_workers)
+        self._results = {}
+        # Results also persist across runs, keyed by rule set and a fingerprint of the data
+        self.results_dir = os.getenv("OPTIMIZER_CACHE_DIR", ".cache/backtests")
+        self._data_fingerprint = ""
+
+    @staticmethod
+    def _fingerprint(signals: list[dict], data_cache: dict) -> str:
+        """Checksum of the signals and their cached candles; changes whenever either does."""
+        digest = hashlib.md5(json.dumps(signals, sort_keys=True, default=str).encode('utf-8'))
+        for key in sorted(data_cache, key=str):
+            digest.update(str(key).encode('utf-8'))
+            candles = data_cache[key]
+            if candles is None:
+                digest.update(b'none')
+            else:
+                for array in candles:
+                    digest.update(array.tobytes())
+        return digest.hexdigest()
+
+    def _result_path(self, key: str) -> str:
+        name = hashlib.md5(f"{key}|{self._data_fingerprint}".encode('utf-8')).hexdigest()
+        return os.path.join(self.results_dir, f"{name}.json")
+
+    def _load_result(self, key: str):
+        try:
+            return jsonutil.load_file(self._result_path(key))
+        except (OSError, jsonutil.JSONDecodeError):
+            return None
+
+    def _store_result(self, key: str, result: dict):
+        try:
+            os.makedirs(self.results_dir, exist_ok=True)
+            jsonutil.dump_file(self._result_path(key), result)
+        except OSError as e:
+            print(f"    [WARNING] Could not cache backtest result: {e}")
+
+    @staticmethod
+    def _round_thresholds(params: dict) -> dict:
+        """Snaps the numeric thresholds to 0.1, so 7.5, 7.50 and "7.5" are one rule set (and one memo entry)."""
+        rounded = dict(params)
+        for name in ('technical_score', 'macro_score', 'zs10_score_max'):
+            if name in rounded:
+                rounded[name] = round(float(rounded[name]), 1)
+        return rounded
+
+    @staticmethod
+    def _params_key(params: dict) -> str:
+        return json.dumps(params, sort_keys=True)
+
+    @staticmethod
+    def _score_arrays(signals: list[dict]) -> dict:
+        """Per-signal score arrays used to apply candidate confirmation rules."""
+        return {
+            'technical_score': np.array([_sheet_score(s.get('Technical Score')) for s in signals]),
+            'macro_score': np.array([_sheet_score(s.get('Macro Score')) for s in signals]),
+            'zs10_score': np.array([_sheet_score(s.get('ZS-10+ Score')) for s in signals]),
+            'catalyst': np.array([str(s.get('Catalyst', 'None')).lower() not in ('none', '', 'n/a') for s in signals]),
+        }
+
+    @staticmethod
+    def _confirmed_matrix(scores: dict, candidates: list[dict], required_conditions: int) -> np.ndarray:
+        """
+        Signals (rows) the DecisionEngine would confirm under each candidate rule set (columns),
+        with the same defaults as its rules; every candidate is applied in one broadcast.
+        """
+        def thresholds(name, default):
+            return np.array([float(params.get(name, default)) for params in candidates])[None, :]
+
+        conditions = (
+            (scores['technical_score'][:, None] >= thresholds('technical_score', 99)).astype(int)
+            + (scores['macro_score'][:, None] >= thresholds('macro_score', 99))
+            + (scores['zs10_score'][:, None] < thresholds('zs10_score_max', 0))
+            + (scores['catalyst'][:, None] & thresholds('catalyst_required', False).astype(bool))
+        )
+        return conditions >= required_conditions
+
+    @classmethod
+    def _confirmed_mask(cls, scores: dict, params: dict, required_conditions: int) -> np.ndarray:
+        """Signals the DecisionEngine would confirm under `params`."""
+        return cls._confirmed_matrix(scores, [params], required_conditions)[:, 0]
+
+    def _evaluate(self, pnls: np.ndarray, scores: dict, params: dict, required_conditions: int) -> dict:
+        """
+        Backtest metrics for the signals confirmed under `params`; memoized per rule set, in memory
+        and on disk. `pnls` is every signal's simulated trade (Backtester.trade_pnls), so a rule set
+        only selects a subset of it and nothing is parsed or simulated again.
+        """
+        key = f"{self._params_key(params)}|{required_conditions}"
+        if key not in self._results:
+            result = self._load_result(key)
+            if result is None:
+                result = self.backtester.summarize(pnls[self._confirmed_mask(scores, params, required_conditions)])
+                self._store_result(key, result)
+            self._results[key] = result
+        return self._results[key]
+
+    def _workers(self, n_jobs=None) -> int:
+        """Pool size for `n_jobs`, scikit-learn style: None uses OPTIMIZER_WORKERS, -1 every core, -2 all but one."""
+        if n_jobs is None:
+            return max(1, self.max_workers)
+        if n_jobs < 0:
+            return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+        return max(1, n_jobs)
+
+    def _win_rates(self, pnls: np.ndarray, scores: dict, candidates: list[dict], required_conditions: int, n_jobs=None) -> np.ndarray:
+        """
+        Win rate (%) of every candidate at once, as `summarize` would report it: wins and trades
+        are counted for all candidates in one (signals x candidates) array op, the candidate
+        columns split across `n_jobs` threads (NumPy releases the GIL).
+        """
+        traded = ~np.isnan(pnls)[:, None]
+        won = (pnls > 0)[:, None]
+
+        def chunk(part):
+            confirmed = self._confirmed_matrix(scores, list(part), required_conditions)
+            trades = (confirmed & traded).sum(axis=0)
+            wins = (confirmed & won).sum(axis=0)
+            return np.where(trades > 0, wins / np.maximum(trades, 1) * 100, 0.0)
+
+        workers = min(self._workers(n_jobs), len(candidates))
+        if workers <= 1:
+            return chunk(candidates)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return np.concatenate(list(executor.map(chunk, np.array_split(np.array(candidates, dtype=object), workers))))
+
+    @staticmethod
+    def _candidate_grid(base_params: dict, step: float) -> list[dict]:
+        """Every technical/macro threshold pair in the ranges the AI is asked to stay within."""
+        return [
+            {**base_params, 'technical_score': round(float(tech), 2), 'macro_score': round(float(macro), 2)}
+            for tech in np.arange(6.0, 9.5 + step / 2, step)
+            for macro in np.arange(5.0, 8.5 + step / 2, step)
+        ]
+
+    @staticmethod
+    def _candidate_sample(base_params: dict, n_trials: int) -> list[dict]:
+        """`n_trials` distinct threshold pairs drawn uniformly (0.1 resolution) from the same ranges as the grid."""
+        points = [(tech, macro) for tech in range(60, 96) for macro in range(50, 86)]
+        picked = random.sample(points, min(n_trials, len(points)))
+        return [{**base_params, 'technical_score': tech / 10, 'macro_score': macro / 10} for tech, macro in picked]
+
+    def _asset_type(self, ticker: str):
+        """AI-detected asset type; only lookups that miss the analyzer's caches spend a rate-limit token."""
+        cached = self.ai_analyzer.cached_asset_type(ticker)
+        if cached is not None:
+            return cached
+        self.ai_rate.acquire()
+        return self.ai_analyzer.get_asset_type(ticker)
 
     def _get_ai_suggested_params(self, last_params: dict, last_performance: dict) -> dict:
         """Asks the AI to suggest new parameters based on the last run."""
         print("    --> Asking AI for new parameter suggestions...")
         
-        system_message = (
-            "You are a quantitative analyst. Your task is to suggest new parameters "
-            "to improve a trading strategy's backtested performance. "
-            "Respond with only a valid JSON object."
-        )
-        
-        user_prompt = (
-            f"Current strategy parameters:\n"
-            f"- technical_score: {last_params.get('technical_score')}\n"
-            f"- macro_score: {last_params.get('macro_score')}\n"
-            f"This resulted in a win_rate of: {last_performance.get('win_rate', 0):.2f}%\n\n"
-            f"Suggest a new set of parameters to improve the win_rate. "
-            f"Parameter Ranges:\n"
-            f"- 'technical_score' must be between 6.0 and 9.5.\n"
-            f"- 'macro_score' must be between 5.0 and 8.5."
+        user_prompt = _SUGGEST_USER_TEMPLATE.format(
+            technical_score=last_params.get('technical_score'),
+            macro_score=last_params.get('macro_score'),
+            win_rate=last_performance.get('win_rate', 0)
         )
 
         try:
-            response_text = self.ai_analyzer._call_ai_provider(system_message, user_prompt, max_tokens=100)
+            response_text = self.ai_analyzer._call_ai_provider(_SUGGEST_SYSTEM_MESSAGE, user_prompt, max_tokens=100)
             cleaned_response = self.ai_analyzer._clean_ai_response(response_text)
-            new_params = json.loads(cleaned_response)
+            suggestion = jsonutil.loads(cleaned_response)
+            if not isinstance(suggestion, dict):
+                raise ValueError(f"expected a JSON object, got {suggestion!r}")
+            # Only the two tuned thresholds are taken, and both must be real numbers
+            new_params = {}
+            for name in ('technical_score', 'macro_score'):
+                value = suggestion.get(name)
+                if isinstance(value, bool) or not np.isfinite(float(value)):
+                    raise ValueError(f"invalid {name}: {value!r}")
+                new_params[name] = float(value)
             print(f"    ...AI suggested: {new_params}")
             return new_params
         except Exception as e:
@@ -50,9 +256,15 @@ class Optimizer:
                 'macro_score': round(random.uniform(5.0, 8.5), 1)
             }
 
-    def run_optimization(self, iterations: int = 10):
+    def run_optimization(self, iterations: int = 10, grid_step: float = 0.5, n_jobs: int = None, n_trials: int = 0):
         """
         Runs the full optimization process.
+
+        Each candidate rule set is scored by backtesting only the signals it would confirm. A
+        `grid_step` grid of thresholds is backtested concurrently first and its best entry seeds
+        the AI-driven iterations; pass grid_step=0 to skip the grid. With `n_trials` set, that many
+        randomly sampled threshold pairs replace the grid, which usually finds an equally good
+        start in far fewer backtests. `n_jobs` sizes the pool that runs them (-1 for every core).
         """
         print("--- Starting AI-Driven Optimization ---")
     
@@ -65,37 +277,73 @@ class Optimizer:
         
         # --- Enrich signals with AI-detected asset type ---
         print("--> Enriching signals with AI-detected asset types for backtesting...")
+        # Asset type depends only on the ticker: ask once per distinct ticker, concurrently
+        tickers = list(dict.fromkeys(signal.get('Ticker') for signal in all_signals if signal.get('Ticker')))
+        with ThreadPoolExecutor(max_workers=max(1, min(self.ai_workers, len(tickers)))) as executor:
+            asset_types = dict(zip(tickers, executor.map(self._asset_type, tickers)))
         enriched_signals = []
         for signal in all_signals:
             ticker = signal.get('Ticker')
             if not ticker: continue
             
-            asset_type = self.ai_analyzer.get_asset_type(ticker)
+            asset_type = asset_types[ticker]
             if asset_type:
                 signal['asset_type'] = asset_type
                 enriched_signals.append(signal)
             else:
                 print(f"    Could not determine asset type for {ticker}, skipping.")
-            time.sleep(1) # To avoid overwhelming the API
         print("--> Enrichment complete.")
         # --- End of enrichment ---
 
-        decision_engine = DecisionEngine(metrics_path=self.metrics_path)
+        # Only the current confirmation rules are needed, not a whole DecisionEngine (and its TradeCalculator)
+        try:
+            metrics = jsonutil.load_config(self.metrics_path)
+        except (FileNotFoundError, jsonutil.JSONDecodeError):
+            print(f"Error: The metrics file was not found at '{self.metrics_path}'")
+            metrics = {}
+        confirmation = metrics.get('jmoney_confirmation', {})
+        required_conditions = confirmation.get('required_conditions', 3)
+        # Every iteration replays the same signals, so fetch each ticker's candles only once
+        data_cache = {}
         best_params = {}
         best_performance = {"win_rate": -1}
     
-        current_params = decision_engine.metrics.get('jmoney_confirmation', {}).get('rules', {})
-        if not current_params:
-            current_params = {'technical_score': 7.5, 'macro_score': 6.0}
+        base_params = confirmation.get('rules', {})
+        if not base_params:
+            base_params = {'technical_score': 7.5, 'macro_score': 6.0}
+        base_params = self._round_thresholds(base_params)
+        current_params = base_params
+        scores = self._score_arrays(enriched_signals)
+
+        # Simulate every signal once; candidate rule sets below only choose which of these trades count
+        pnls = self.backtester.trade_pnls(enriched_signals, data_cache=data_cache)
+        self._data_fingerprint = self._fingerprint(enriched_signals, data_cache)
+
+        if n_trials:
+            print(f"--> Backtesting {n_trials} randomly sampled thresholds...")
+            grid = self._candidate_sample(base_params, n_trials)
+        elif grid_step:
+            print(f"--> Backtesting a {grid_step} grid of thresholds...")
+            grid = self._candidate_grid(base_params, grid_step)
+        else:
+            grid = []
+        if grid:
+            # The configured rules are the previous run's best: score them alongside the others
+            # so a new start only replaces them if it actually backtests better
+            if base_params not in grid:
+                grid.insert(0, base_params)
+            # Rank the whole grid from the trade arrays, then take full metrics for the winner only
+            best = int(np.argmax(self._win_rates(pnls, scores, grid, required_conditions, n_jobs=n_jobs)))
+            best_params = grid[best]
+            best_performance = self._evaluate(pnls, scores, best_params, required_conditions)
+            current_params = best_params
+            print(f"Best starting params: {best_params} (Win Rate = {best_performance.get('win_rate', 0):.2f}%)")
     
         for i in range(iterations):
             print(f"\n--- Iteration {i + 1}/{iterations} ---")
             print(f"Testing params: {current_params}")
     
-            temp_metrics = {"jmoney_confirmation": {"required_conditions": 3, "rules": current_params}}
-            decision_engine.metrics = temp_metrics
-    
-            backtest_results = self.backtester.run_backtest(enriched_signals)
+            backtest_results = self._evaluate(pnls, scores, current_params, required_conditions)
             print(f"Performance: Win Rate = {backtest_results.get('win_rate', 0):.2f}%")
     
             if backtest_results.get('win_rate', 0) > best_performance.get('win_rate', -1):
@@ -104,14 +352,15 @@ class Optimizer:
                 print(f"New best performance found!")
     
             if i < iterations - 1: # No need to get params on the last run
-                current_params = self._get_ai_suggested_params(current_params, backtest_results)
+                # The AI only tunes the two thresholds; keep the other rules from the config
+                current_params = self._round_thresholds({**base_params, **self._get_ai_suggested_params(current_params, backtest_results)})
     
         print(f"\n--- Optimization Complete ---")
         print(f"Best Win Rate Found: {best_performance.get('win_rate', 0):.2f}%")
         print(f"Best Parameters: {best_params}")
     
         if best_params:
-            final_metrics = {"jmoney_confirmation": {"required_conditions": 3, "rules": best_params}}
-            with open(self.metrics_path, 'w') as f:
-                json.dump(final_metrics, f, indent=2)
+            final_metrics = {"jmoney_confirmation": {"required_conditions": required_conditions, "rules": best_params}}
+            # Atomic replace: an interrupted run can't leave a truncated metrics file behind
+            jsonutil.dump_file(self.metrics_path, final_metrics, indent=True)
             print(f"\n✅ {self.metrics_path} has been updated with the optimal parameters.")
\ No newline at end of file
@@ -82,6 +82,24 @@ class OutputManager:
                 return value_str
         return 'N/A'
 
+    def _read_columns(self, worksheet, headers: list[str], columns: tuple) -> list[dict]:
+        """
+        Reads only `columns` of the sheet's data rows, in one request, as records like
+        get_all_records() returns. Falls back to reading every record when the sheet's header row
+        doesn't match `headers`.
+        """
+        ranges = [f"{chr(ord('A') + headers.index(name))}:{chr(ord('A') + headers.index(name))}" for name in columns]
+        values = worksheet.batch_get(ranges)
+        header_cells = [column[0][0] if column and column[0] else '' for column in values]
+        if any(column for column in values) and header_cells != list(columns):
+            return worksheet.get_all_records()
+        # Blank cells come back as empty rows, and trailing ones are dropped
+        row_count = max((len(column) for column in values), default=0)
+        return [
+            {name: (column[row][0] if row < len(column) and column[row] else '') for name, column in zip(columns, values)}
+            for row in range(1, row_count)
+        ]
+
     def export_signals_to_sheets(self, signals: list[dict]) -> bool:
         """
         Exports the final signals with all relevant data to Google Sheets.
@@ -100,10 +118,13 @@ class OutputManager:
             "Confidence Score", "Catalyst", "Summary", "JMoney Confirmed", "Reasoning"
         ]
         
-        existing_data = []
+        existing_keys = set()
+        # None when the sheet couldn't be read; [] means it has no rows yet and needs headers
+        existing_records = None
         try:
-            existing_records = worksheet.get_all_records()
-            existing_data = [(record.get('Ticker', ''), record.get('Summary', ''), record.get('Timestamp', '')) for record in existing_records]
+            existing_records = self._read_columns(worksheet, headers, ('Ticker', 'Summary'))
+            # (ticker, headline) pairs already on the sheet, for O(1) duplicate checks
+            existing_keys = {(record.get('Ticker', ''), record.get('Summary', '')) for record in existing_records}
         except Exception as e:
             print(f"    Note: Could not check for existing data: {e}")
         
@@ -116,65 +137,60 @@ class OutputManager:
             catalyst_headline = s.get('catalyst', s.get('reasoning', 'N/A')) 
             timestamp = pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
             
-            is_duplicate = False
-            for existing_ticker, existing_headline, existing_timestamp in existing_data:
-                if (existing_ticker == ticker and 
-                    existing_headline == catalyst_headline):
-                    is_duplicate = True
-                    break
-            
-            if is_duplicate:
+            if (ticker, catalyst_headline) in existing_keys:
                 duplicates_skipped += 1
                 print(f"    Skipping duplicate: {ticker} - {catalyst_headline[:50]}...")
                 continue
+            # Also catches the same signal appearing twice in this batch
+            existing_keys.add((ticker, catalyst_headline))
             
             signal = s.get('signal', 'Neutral')
             direction = "Long" if signal == "Buy" else "Short" if signal == "Sell" else "Neutral"
             
-            data_to_export.append({
-                "Timestamp": timestamp,
-                "Validee": self._get_signal_emoji(signal),
-                "Ticker": ticker,
-                "Source": s.get('source', 'Unknown'),
-                "Signal": signal,
-                "Strategy": s.get('strategy', 'N/A'),
-                "Direction": direction,
-                "Entry": self._format_monetary_value(s.get('entry', 'N/A')),
-                "Stop Loss": self._format_monetary_value(s.get('stop_loss', 'N/A')),
-                "TP1": self._format_monetary_value(s.get('tp1', 'N/A')),
-                "TP2": self._format_monetary_value(s.get('tp2', 'N/A')),
-                "TP Strategy": s.get('tp_strategy', 'Manual exit required'),
-                "Technical Score": f"{s.get('technical_score', 0)}/10",
-                "ZS-10+ Score": f"{s.get('zs10_score', 0)}/10",
-                "Macro Score": f"{s.get('macro_score', 0)}/10",
-                "Sentiment Score": f"{s.get('sentiment_score', 0)}/10",
-                "Confidence Score": f"{s.get('confidence_score', 0.0)}/10",
-                "Catalyst": catalyst_type,
-                "Summary": catalyst_headline,
-                "JMoney Confirmed": 'YES' if s.get('jmoney_confirmed', False) else 'NO',
-                "Reasoning": s.get('confirmation_reason', 'Ticker doesn\'t meet confirmation requirements')
-            })
+            # One row per signal, in header order
+            data_to_export.append([
+                timestamp,
+                self._get_signal_emoji(signal),
+                ticker,
+                s.get('source', 'Unknown'),
+                signal,
+                s.get('strategy', 'N/A'),
+                direction,
+                self._format_monetary_value(s.get('entry', 'N/A')),
+                self._format_monetary_value(s.get('stop_loss', 'N/A')),
+                self._format_monetary_value(s.get('tp1', 'N/A')),
+                self._format_monetary_value(s.get('tp2', 'N/A')),
+                s.get('tp_strategy', 'Manual exit required'),
+                f"{s.get('technical_score', 0)}/10",
+                f"{s.get('zs10_score', 0)}/10",
+                f"{s.get('macro_score', 0)}/10",
+                f"{s.get('sentiment_score', 0)}/10",
+                f"{s.get('confidence_score', 0.0)}/10",
+                catalyst_type,
+                catalyst_headline,
+                'YES' if s.get('jmoney_confirmed', False) else 'NO',
+                s.get('confirmation_reason', 'Ticker doesn\'t meet confirmation requirements')
+            ])
         
         if duplicates_skipped > 0:
             print(f"    Skipped {duplicates_skipped} duplicate entries")
         
-        df = pd.DataFrame(data_to_export, columns=headers)
-        df = df.fillna('N/A')
+        # Blank cells read as N/A on the sheet
+        rows = [['N/A' if value is None or value != value else value for value in row] for row in data_to_export]
 
         try:
-            # Get existing data
-            existing_data = worksheet.get_all_records()
-            if not existing_data:
+            # The records read for the duplicate check tell us whether the sheet is empty
+            if existing_records == []:
                 # If sheet is empty, add headers first
-                worksheet.update([df.columns.values.tolist()] + df.values.tolist())
+                worksheet.update([headers] + rows)
             else:
                 # Append new data without headers
-                worksheet.append_rows(df.values.tolist())
+                worksheet.append_rows(rows)
         except Exception as e:
             print(f"Error appending data, trying to clear and rewrite: {e}")
             # Fallback: clear and write all data
             worksheet.clear()
-            worksheet.update([df.columns.values.tolist()] + df.values.tolist())
+            worksheet.update([headers] + rows)
             
         print("    ...export complete.")
         return True
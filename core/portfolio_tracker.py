@@ -1,4 +1,3 @@
-import json
 import pandas as pd
 from datetime import datetime
 from .data_fetcher import DataFetcher
@@ -6,6 +5,7 @@ from .ai_analyzer import AIAnalyzer # Add this import
 from .output_manager import OutputManager
 import os
 from utils.logger import logger
+from utils import jsonutil
 
 class PortfolioTracker:
     """
@@ -52,9 +52,8 @@ class PortfolioTracker:
     def _load_portfolio(self) -> dict:
         """Loads the portfolio from a JSON file, creating it if it doesn't exist."""
         try:
-            with open(self.portfolio_path, 'r') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
+            return jsonutil.load_file(self.portfolio_path)
+        except (FileNotFoundError, jsonutil.JSONDecodeError):
             # If the file doesn't exist or is empty, create a default structure
             print(f"    '{self.portfolio_path}' not found or invalid. Creating a new one.")
             default_portfolio = {"trades": [], "summary": {}}
@@ -66,8 +65,7 @@ class PortfolioTracker:
         if data_to_save is None:
             data_to_save = self.portfolio
             
-        with open(self.portfolio_path, 'w') as f:
-            json.dump(data_to_save, f, indent=2)
+        jsonutil.dump_file(self.portfolio_path, data_to_save, indent=True)
 
     def add_trade(self, signal: dict):
         """Adds a new trade to the portfolio."""
@@ -1,3 +1,4 @@
+import asyncio
 import pandas as pd
 import numpy as np
 from .ai_analyzer import AIAnalyzer
@@ -185,11 +186,20 @@ class ScoringEngine:
             asset['technical_score'] = self.calculate_technical_score(market_data)
             asset['zs10_score'] = self.calculate_zs10_score(market_data)
 
-            ai_scores = self.analyzer.get_detailed_scores(
-                ticker=asset.get('ticker'),
-                catalyst_headline=asset.get('catalyst')
-            )
-            
+        items = [(asset.get('ticker'), asset.get('catalyst')) for asset in enriched_assets]
+
+        # Large non-interactive passes can go through the (cheaper, slower) OpenAI Batch API
+        batch_threshold = int(os.getenv("AI_BATCH_SCORING_THRESHOLD", "0"))
+        if batch_threshold and len(items) > batch_threshold and self.analyzer.provider == "openai":
+            batch_id = self.analyzer.submit_scoring_batch(items)
+            batch_results = self.analyzer.poll_batch(batch_id)
+            all_ai_scores = [batch_results.get(f"{i}:{ticker}", {}) for i, (ticker, _) in enumerate(items)]
+        else:
+            # AI scoring is network-bound, so all assets are scored concurrently in one batch
+            all_ai_scores = asyncio.run(self.analyzer.score_many(items))
+
+        # Failed scorings come back as {} (a_get_detailed_scores logs them), so the defaults apply
+        for asset, ai_scores in zip(enriched_assets, all_ai_scores):
             asset.update({
                 'macro_score': ai_scores.get('macro_score', 5),
                 'sentiment_score': ai_scores.get('sentiment_score', 5),
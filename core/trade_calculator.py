@@ -1,9 +1,9 @@
 import pandas as pd
 import numpy as np
 import os
-import json
 from openai import OpenAI
 import google.generativeai as genai
+from utils import jsonutil
 
 from dotenv import load_dotenv
 load_dotenv()
@@ -15,9 +15,8 @@ class TradeCalculator:
     def __init__(self):
         """Initializes the TradeCalculator."""
         try:
-            with open("config/trading_config.json", 'r') as f:
-                self.trading_config = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
+            self.trading_config = jsonutil.load_config("config/trading_config.json")
+        except (FileNotFoundError, jsonutil.JSONDecodeError):
             self.trading_config = {"account_balance": 10000, "risk_per_trade_pct": 1.5}
         
         self.ai_client = None # Simplified for brevity, AI TP strategy remains
@@ -43,12 +43,12 @@ def run_backtest_and_generate_outputs():
         # Fallback: alternate wins and losses
         outcomes = {}
 
-    for _, row in signals_df.iterrows():
+    rows = signals_df[['Ticker', 'Direction', 'JMoney Confirmed']].itertuples(index=False, name=None)
+    for ticker, direction, confirmed in rows:
         pnl = 0
         current_equity = equity[-1] 
         
-        if row['JMoney Confirmed'] == 'YES':
-            ticker = row['Ticker']
+        if confirmed == 'YES':
             
             if ticker in outcomes:
                 # Use the predefined outcome from the trades pool
@@ -75,8 +75,8 @@ def run_backtest_and_generate_outputs():
         
         if pnl != 0: 
             trades.append({
-                "ticker": row['Ticker'],
-                "direction": row['Direction'],
+                "ticker": ticker,
+                "direction": direction,
                 "pnl": round(pnl, 2),
                 "equity": round(new_equity, 2)
             })
@@ -56,6 +56,7 @@ def run_workflow(is_manual_trigger=False):
         logger.start_section("STEP 1: NEWS SCANNING")
         scanner = NewsScanner(sources_path=os.getenv("SOURCES_PATH", "config/sources.json"))
         headlines_by_source = scanner.scan_headlines()
+        scanner.close()
         headlines_with_sources = [f"[{source}] {headline}" for source, headlines in headlines_by_source.items() for headline in headlines]
         logger.success(f"Scan complete. Found {len(headlines_with_sources)} total headlines.")
 
@@ -92,7 +93,7 @@ def run_workflow(is_manual_trigger=False):
         # --- STEP 5: Make final decision and generate signals ---
         logger.start_section("STEP 5: DECISION ENGINE")
         decision_engine = DecisionEngine(metrics_path=os.getenv("METRICS_PATH", "config/scoring_metrics.json"))
-        final_signals = decision_engine.run_engine(scored_assets)
+        final_signals = decision_engine.run_engine_vectorized(scored_assets)
         logger.success(f"Generated {len(final_signals)} final signals.")
         
         # --- Add confirmed trades to portfolio ---
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('gspread')
+pytest.importorskip('oauth2client')
+
+from core.backtester import Backtester, _candle_arrays, _parse_signals
+
+
+def test_parse_signals_resolves_aliases_and_price_decorations():
+    frame = _parse_signals([
+        {'Ticker': 'AAPL', 'Entry': '$100.00', 'Stop Loss': '$95.00 (ref)', 'TP1': '$110.00 (10.0%)', 'Signal': 'Buy'},
+        {'ticker': 'BTC', 'entry_price': 20000, 'stop_loss': 21000, 'take_profit': 18000, 'signal': ' SELL ',
+         'asset_type': 'crypto'},
+    ])
+
+    assert frame[['entry', 'sl', 'tp']].to_numpy().tolist() == [[100.0, 95.0, 110.0], [20000.0, 21000.0, 18000.0]]
+    assert frame['is_buy'].tolist() == [True, False]
+    assert frame['asset_type'].tolist() == ['stocks', 'crypto']
+    assert frame['valid'].tolist() == [True, True]
+
+
+@pytest.mark.parametrize('signal', [
+    {'Ticker': 'AAPL', 'Entry': '$100.00', 'Stop Loss': '$95.00', 'Signal': 'Buy'},
+    {'Ticker': 'AAPL', 'Entry': 'N/A', 'Stop Loss': '$95.00', 'TP1': '$110.00', 'Signal': 'Buy'},
+    {'Ticker': 'AAPL', 'Entry': '$100.00', 'Stop Loss': '$95.00', 'TP1': '$110.00', 'Signal': 'Hold'},
+    {'Entry': '$100.00', 'Stop Loss': '$95.00', 'TP1': '$110.00', 'Signal': 'Buy'},
+])
+def test_parse_signals_marks_untradable_rows_invalid(signal):
+    assert _parse_signals([signal])['valid'].tolist() == [False]
+
+
+def test_candle_arrays_drop_candles_with_unparseable_prices():
+    lows, highs = _candle_arrays(pd.DataFrame({'Low': [1.0, 'bad', None], 'High': ['2.5', 3.0, 4.0]}))
+
+    assert lows[0] == 1.0 and highs[0] == 2.5
+    assert np.isnan(lows[1]) and np.isnan(highs[1])
+    # A missing low only blanks that side of the candle
+    assert np.isnan(lows[2]) and highs[2] == 4.0
+
+
+def test_trade_pnls_skips_invalid_signals_and_unknown_tickers():
+    backtester = Backtester(output_manager=None)
+    signals = [
+        {'Ticker': 'AAPL', 'Entry': '100', 'Stop Loss': '95', 'TP1': '110', 'Signal': 'Buy'},
+        {'Ticker': 'AAPL', 'Entry': '100', 'Stop Loss': '105', 'TP1': '90', 'Signal': 'Sell'},
+        {'Ticker': 'AAPL', 'Entry': 'N/A', 'Stop Loss': '95', 'TP1': '110', 'Signal': 'Buy'},
+        {'Ticker': 'MSFT', 'Entry': '100', 'Stop Loss': '95', 'TP1': '110', 'Signal': 'Buy'},
+    ]
+    data_cache = {
+        ('AAPL', 'stocks'): (np.array([99.0, 101.0]), np.array([101.0, 111.0])),
+        ('MSFT', 'stocks'): None,
+    }
+
+    pnls = backtester.trade_pnls(signals, data_cache=data_cache)
+    results = backtester.summarize(pnls)
+
+    assert pnls[0] > 0 and pnls[1] < 0
+    assert np.isnan(pnls[2:]).all()
+    assert (results['total_trades'], results['wins'], results['skipped_signals']) == (2, 1, 2)
+
+
+def test_a_failed_asset_type_only_skips_its_own_signals(monkeypatch):
+    backtester = Backtester(output_manager=None)
+
+    def get_many(tickers, asset_type='stocks'):
+        if asset_type == 'crypto':
+            raise ConnectionError('exchange down')
+        return {ticker: pd.DataFrame({'Low': [99.0, 101.0], 'High': [101.0, 111.0]}) for ticker in tickers}
+
+    monkeypatch.setattr(backtester.data_fetcher, 'get_many', get_many)
+    pnls = backtester.trade_pnls([
+        {'Ticker': 'AAPL', 'Entry': '100', 'Stop Loss': '95', 'TP1': '110', 'Signal': 'Buy'},
+        {'Ticker': 'BTC', 'Entry': '100', 'Stop Loss': '95', 'TP1': '110', 'Signal': 'Buy', 'asset_type': 'crypto'},
+    ], data_cache={})
+
+    assert pnls[0] > 0 and np.isnan(pnls[1])
+
+
+def test_failed_fetches_are_not_kept_in_the_instance_cache(monkeypatch):
+    backtester = Backtester(output_manager=None)
+    calls = []
+
+    def get_many(tickers, asset_type='stocks'):
+        calls.append(list(tickers))
+        if len(calls) == 1:
+            return {'AAPL': pd.DataFrame({'Low': [99.0], 'High': [111.0]}), 'MSFT': None}
+        return {ticker: pd.DataFrame({'Low': [99.0], 'High': [111.0]}) for ticker in tickers}
+
+    monkeypatch.setattr(backtester.data_fetcher, 'get_many', get_many)
+    signals = [{'Ticker': ticker, 'Entry': '100', 'Stop Loss': '95', 'TP1': '110', 'Signal': 'Buy'}
+               for ticker in ('AAPL', 'MSFT')]
+
+    first = backtester.trade_pnls(signals)
+    second = backtester.trade_pnls(signals)
+
+    assert np.isnan(first[1]) and not np.isnan(second).any()
+    # Only the ticker that failed is fetched again
+    assert calls == [['AAPL', 'MSFT'], ['MSFT']]
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from core import _bt_kernels as kernels
+from core._bt_kernels import EXIT_NONE, EXIT_SL, EXIT_TP
+
+# Compiled (or plain Python without Numba) loop and the NumPy broadcast must agree
+FIRST_EXITS = [kernels._first_exits_loop, kernels._first_exits_numpy]
+
+
+def candles(lows, highs):
+    return np.array(lows, dtype=np.float64), np.array(highs, dtype=np.float64)
+
+
+def first_exit(first_exits, lows, highs, sl, tp, is_buy, sl_before_tp):
+    """Exit code of a single trade through a batch kernel."""
+    codes = first_exits(lows, highs, np.array([sl], dtype=np.float64), np.array([tp], dtype=np.float64),
+                        np.array([is_buy]), sl_before_tp)
+    return int(codes[0])
+
+
+@pytest.mark.parametrize('first_exits', FIRST_EXITS)
+@pytest.mark.parametrize('lows, highs, is_buy, expected', [
+    ([99.0, 94.0], [101.0, 100.0], True, EXIT_SL),
+    ([99.0, 100.0], [101.0, 106.0], True, EXIT_TP),
+    ([99.0, 98.0], [101.0, 102.0], True, EXIT_NONE),
+    ([99.0, 100.0], [101.0, 106.0], False, EXIT_SL),
+    ([96.0, 94.0], [101.0, 100.0], False, EXIT_TP),
+    ([], [], True, EXIT_NONE),
+])
+def test_first_exit(first_exits, lows, highs, is_buy, expected):
+    sl, tp = (95.0, 105.0) if is_buy else (105.0, 95.0)
+    assert first_exit(first_exits, *candles(lows, highs), sl, tp, is_buy, True) == expected
+
+
+@pytest.mark.parametrize('first_exits', FIRST_EXITS)
+def test_candle_hitting_both_levels_uses_precedence(first_exits):
+    lows, highs = candles([94.0], [106.0])
+    assert first_exit(first_exits, lows, highs, 95.0, 105.0, True, True) == EXIT_SL
+    assert first_exit(first_exits, lows, highs, 95.0, 105.0, True, False) == EXIT_TP
+
+
+@pytest.mark.parametrize('first_exits', FIRST_EXITS)
+def test_missing_price_only_blocks_its_own_side(first_exits):
+    """A NaN low can't trigger a buy's stop-loss, but the candle's high still reaches take-profit."""
+    assert first_exit(first_exits, *candles([np.nan], [106.0]), 95.0, 105.0, True, True) == EXIT_TP
+    assert first_exit(first_exits, *candles([94.0], [np.nan]), 95.0, 105.0, True, True) == EXIT_SL
+    assert first_exit(first_exits, *candles([np.nan], [np.nan]), 95.0, 105.0, True, True) == EXIT_NONE
+    # For a sell the sides swap: the high is the stop-loss side
+    assert first_exit(first_exits, *candles([94.0], [np.nan]), 105.0, 95.0, False, True) == EXIT_TP
+
+
+@pytest.mark.parametrize('sl_before_tp', [True, False])
+def test_batch_matches_trades_scanned_one_at_a_time(sl_before_tp):
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.normal(0, 1, 60))
+    lows = close - rng.uniform(0, 2, close.size)
+    highs = close + rng.uniform(0, 2, close.size)
+    lows[rng.random(close.size) < 0.2] = np.nan
+    highs[rng.random(close.size) < 0.2] = np.nan
+    is_buy = rng.random(200) < 0.5
+    width = rng.uniform(0.5, 8, is_buy.size)
+    sls = np.where(is_buy, 100 - width, 100 + width)
+    tps = np.where(is_buy, 100 + 1.5 * width, 100 - 1.5 * width)
+
+    expected = [first_exit(kernels._first_exits_loop, lows, highs, sl, tp, buy, sl_before_tp)
+                for sl, tp, buy in zip(sls, tps, is_buy)]
+    for first_exits in FIRST_EXITS:
+        assert first_exits(lows, highs, sls, tps, is_buy, sl_before_tp).tolist() == expected
@@ -0,0 +1,76 @@
+import os
+
+import pandas as pd
+
+from core.cache import FileCache, ResponseCache
+
+
+def cache_files(root):
+    return sorted(name for namespace in os.listdir(root) for name in os.listdir(os.path.join(root, namespace)))
+
+
+def test_file_cache_round_trip_and_expiry(tmp_path):
+    cache = FileCache(str(tmp_path))
+    cache.set('ohlcv', 'AAPL', 'yahoo|1h', pd.DataFrame({'Close': [1.0, 2.0]}))
+
+    assert cache.get('ohlcv', 'AAPL', 'yahoo|1h', ttl=60)['Close'].tolist() == [1.0, 2.0]
+    assert cache.get('ohlcv', 'AAPL', 'other', ttl=60) is None
+    assert cache.get('ohlcv', 'AAPL', 'yahoo|1h', ttl=-1) is None
+
+
+def test_invalidate_only_drops_the_exact_name(tmp_path):
+    cache = FileCache(str(tmp_path))
+    frame = pd.DataFrame({'Close': [1.0]})
+    for name in ('BTC', 'BTC/USD', 'BRK', 'BRK.B'):
+        cache.set('ohlcv', name, 'key', frame)
+
+    cache.invalidate('BTC')
+    cache.invalidate('BRK')
+
+    assert [name.rsplit('_', 1)[0] for name in cache_files(tmp_path)] == ['BRK_B', 'BTC_USD']
+
+
+def test_replacing_an_entry_does_not_inflate_the_tracked_size(tmp_path):
+    cache = FileCache(str(tmp_path), max_bytes=10 ** 9)
+    frame = pd.DataFrame({'Close': range(1000)})
+    cache.set('ohlcv', 'AAPL', 'key', frame)
+    for _ in range(3):
+        cache.set('ohlcv', 'AAPL', 'key', frame)
+
+    assert cache._size == sum(size for _, size, _ in cache._entries())
+
+
+def test_oldest_entries_are_evicted_past_max_bytes(tmp_path):
+    frame = pd.DataFrame({'Close': range(1000)})
+    probe = FileCache(str(tmp_path / 'probe'))
+    probe.set('ohlcv', 'X', 'key', frame)
+    entry_size = probe._entries()[0][1]
+
+    cache = FileCache(str(tmp_path / 'cache'), max_bytes=int(entry_size * 2.5))
+    for i, name in enumerate(('A', 'B', 'C')):
+        cache.set('ohlcv', name, 'key', frame)
+        path = cache._path('ohlcv', name, 'key')
+        os.utime(path, (1000 + i, 1000 + i))
+
+    assert [name.split('_')[0] for name in cache_files(tmp_path / 'cache')] == ['B', 'C']
+
+
+def test_response_cache_expiry(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'responses.sqlite'), default_ttl=60)
+    cache.set('fresh', 'value')
+    cache.set('stale', 'value', expire=-1)
+
+    assert cache.get('fresh') == 'value'
+    assert cache.get('stale') is None
+    assert 'stale' not in cache
+
+
+def test_write_failure_only_warns(tmp_path):
+    # A regular file where the cache directory should be: makedirs fails
+    blocker = tmp_path / 'cache'
+    blocker.write_text('')
+    cache = FileCache(str(blocker))
+
+    cache.set('ohlcv', 'AAPL', 'key', pd.DataFrame({'Close': [1.0]}))
+
+    assert cache.get('ohlcv', 'AAPL', 'key', ttl=60) is None
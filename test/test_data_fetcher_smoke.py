@@ -1,4 +1,6 @@
+import asyncio
 import os
+import threading
 import pandas as pd
 import pytest
 from unittest.mock import Mock
@@ -10,6 +12,8 @@ from core.data_fetcher import DataFetcher
 def clear_env(monkeypatch):
     # Ensure a consistent threshold
     monkeypatch.setenv('PRICE_MISMATCH_THRESHOLD_PCT', '10')
+    # Always exercise the fetch path, never frames cached on disk by earlier runs
+    monkeypatch.setenv('FETCH_CACHE_TTL_SEC', '0')
     yield
 
 
@@ -49,3 +53,172 @@ def test_fallback_to_crypto_when_yahoo_missing(monkeypatch):
 
     assert df is not None
     assert float(df['Close'].iloc[-1]) == 20000.0
+
+
+def test_slow_preferred_source_loses_race(monkeypatch):
+    """A fallback source that answers first wins while the preferred source is still pending."""
+    monkeypatch.setenv('FETCH_RACE_STAGGER_SEC', '0.05')
+    slow_yahoo = threading.Event()
+
+    def fetch_yahoo(self, t, asset_type='crypto'):
+        slow_yahoo.wait(2)
+        return make_df(1.0)
+
+    monkeypatch.setattr(DataFetcher, '_fetch_yahoo', fetch_yahoo)
+    monkeypatch.setattr(DataFetcher, '_fetch_crypto', lambda self, t, source: make_df(20000.0))
+
+    df = DataFetcher().get_data('BTC/USD', asset_type='crypto', preferred_sources=['yahoo', 'crypto'])
+    slow_yahoo.set()
+
+    assert df is not None
+    assert float(df['Close'].iloc[-1]) == 20000.0
+
+
+def test_get_many_splits_yahoo_batch_and_falls_back(monkeypatch):
+    """Tickers come from one batched Yahoo download; ones missing from it go through get_data."""
+    index = [pd.Timestamp.now()]
+    batch = pd.concat({'AAPL': pd.DataFrame({'Close': [100.0]}, index=index),
+                       'MSFT': pd.DataFrame({'Close': [200.0]}, index=index)}, axis=1)
+    download = Mock(return_value=batch)
+    monkeypatch.setattr('core.data_fetcher.yf.download', download)
+    monkeypatch.setattr(DataFetcher, 'get_data', lambda self, t, asset_type='stocks': make_df(300.0))
+
+    frames = DataFetcher().get_many(['AAPL', 'MSFT', 'XYZ'], asset_type='stocks')
+
+    assert download.call_count == 1
+    assert float(frames['AAPL']['Close'].iloc[-1]) == 100.0
+    assert float(frames['MSFT']['Close'].iloc[-1]) == 200.0
+    assert float(frames['XYZ']['Close'].iloc[-1]) == 300.0
+
+
+def test_latest_prices_from_one_quote_request(monkeypatch):
+    """Latest prices come from a single Yahoo quote request; unquoted tickers fall back to get_many."""
+    response = Mock(content=b'{"quoteResponse": {"result": ['
+                            b'{"symbol": "AAPL", "regularMarketPrice": 101.5, "regularMarketTime": 1700000000},'
+                            b'{"symbol": "MSFT", "regularMarketPrice": 202.5}]}}')
+    fetcher = DataFetcher()
+    monkeypatch.setattr(fetcher._http, 'get', Mock(return_value=response))
+    monkeypatch.setattr(DataFetcher, 'get_many', lambda self, t, asset_type='stocks': {'XYZ': make_df(300.0)})
+
+    prices = fetcher.get_latest_prices(['AAPL', 'MSFT', 'XYZ'], asset_type='stocks')
+
+    assert fetcher._http.get.call_count == 1
+    assert float(prices['AAPL']['Close'].iloc[-1]) == 101.5
+    assert float(prices['MSFT']['Close'].iloc[-1]) == 202.5
+    assert float(prices['XYZ']['Close'].iloc[-1]) == 300.0
+
+
+def test_cross_check_source_fetched_alongside_primary(monkeypatch):
+    """Polygon is fetched concurrently with Yahoo and reused for the cross-check, not refetched."""
+    polygon_started = threading.Event()
+    overlapped = []
+    polygon_calls = []
+
+    def fetch_yahoo(self, t, asset_type='stocks'):
+        overlapped.append(polygon_started.wait(2))
+        return make_df(100.0)
+
+    def fetch_polygon(self, t, asset_type='stocks'):
+        polygon_calls.append(t)
+        polygon_started.set()
+        return make_df(150.0)
+
+    monkeypatch.setattr(DataFetcher, '_fetch_yahoo', fetch_yahoo)
+    monkeypatch.setattr(DataFetcher, '_fetch_polygon', fetch_polygon)
+    monkeypatch.setenv('POLYGON_API_KEY', 'test')
+    mock_output = Mock()
+
+    df = DataFetcher(output_manager=mock_output).get_data('AAPL', asset_type='stocks', preferred_sources=['yahoo', 'polygon'])
+
+    assert float(df['Close'].iloc[-1]) == 100.0
+    assert overlapped == [True]
+    assert len(polygon_calls) == 1
+    assert mock_output.write_price_alert.called
+
+
+def test_quote_only_source_never_beats_history(monkeypatch):
+    """Google Finance's single-row quote is only a fallback, even when it answers first."""
+    monkeypatch.setenv('FETCH_RACE_STAGGER_SEC', '0')
+    history = pd.DataFrame({'Close': [float(i) for i in range(90)]})
+
+    def fetch_yahoo(self, t, asset_type='stocks'):
+        threading.Event().wait(0.2)
+        return history
+
+    monkeypatch.setattr(DataFetcher, '_fetch_yahoo', fetch_yahoo)
+    monkeypatch.setattr(DataFetcher, '_fetch_google_finance', lambda self, t, asset_type: make_df(1.0))
+
+    df = DataFetcher().get_data('SPY', asset_type='stocks', preferred_sources=['google_finance', 'yahoo'])
+    assert len(df) == 90
+
+    monkeypatch.setattr(DataFetcher, '_fetch_yahoo', lambda self, t, asset_type='stocks': None)
+    df = DataFetcher().get_data('SPY', asset_type='stocks', preferred_sources=['yahoo', 'google_finance'])
+    assert float(df['Close'].iloc[-1]) == 1.0
+
+
+def test_race_caps_concurrent_exchanges(monkeypatch):
+    """Only FETCH_RACE_MAX_EXCHANGES exchanges are queried at once; later ones wait for a failure."""
+    monkeypatch.setenv('FETCH_RACE_STAGGER_SEC', '0')
+    monkeypatch.setenv('FETCH_RACE_MAX_EXCHANGES', '2')
+    lock = threading.Lock()
+    running = [0, 0]
+
+    def fetch_crypto(self, t, source):
+        with lock:
+            running[0] += 1
+            running[1] = max(running[1], running[0])
+        threading.Event().wait(0.05)
+        with lock:
+            running[0] -= 1
+        return make_df(20000.0) if source == 'mexc' else None
+
+    monkeypatch.setattr(DataFetcher, '_fetch_crypto', fetch_crypto)
+
+    df = DataFetcher().get_data('BTC/USD', asset_type='crypto',
+                                preferred_sources=['crypto', 'coinbase', 'kucoin', 'kraken', 'mexc'])
+
+    assert float(df['Close'].iloc[-1]) == 20000.0
+    assert running[1] == 2
+
+
+def test_get_many_survives_a_market_load_failure(monkeypatch):
+    """An exchange outage while loading markets falls back to per-ticker get_data instead of raising."""
+    def ensure_markets(self, source, exchange):
+        raise ConnectionError('exchange down')
+
+    monkeypatch.setattr(DataFetcher, '_ensure_markets', ensure_markets)
+    monkeypatch.setattr(DataFetcher, '_download_yahoo', lambda self, tickers, asset_type: {})
+    monkeypatch.setattr(DataFetcher, 'get_data', lambda self, t, asset_type='stocks': make_df(20000.0))
+
+    fetcher = DataFetcher()
+    try:
+        assert fetcher.fetch_crypto_many(['BTC/USD'], 'crypto') == {'BTC/USD': None}
+        frames = fetcher.get_many(['BTC/USD', 'ETH/USD'], asset_type='crypto')
+    finally:
+        fetcher.close()
+
+    assert set(frames) == {'BTC/USD', 'ETH/USD'}
+    assert float(frames['BTC/USD']['Close'].iloc[-1]) == 20000.0
+
+
+def test_stuck_crypto_batch_times_out_and_frees_the_loop(monkeypatch):
+    """A batch that never finishes returns None frames after its bound, and later batches still run."""
+    calls = []
+
+    async def fetch_many(self, tickers, source):
+        calls.append(tickers)
+        if len(calls) == 1:
+            await asyncio.sleep(60)
+        return {ticker: make_df(1.0) for ticker in tickers}
+
+    monkeypatch.setattr(DataFetcher, '_fetch_crypto_many_async', fetch_many)
+    monkeypatch.setattr(DataFetcher, '_batch_timeout', lambda self, source, count: 0.2)
+
+    fetcher = DataFetcher()
+    try:
+        assert fetcher.fetch_crypto_many(['BTC/USD'], 'crypto') == {'BTC/USD': None}
+        frames = fetcher.fetch_crypto_many(['ETH/USD'], 'crypto')
+    finally:
+        fetcher.close()
+
+    assert float(frames['ETH/USD']['Close'].iloc[-1]) == 1.0
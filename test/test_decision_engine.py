@@ -0,0 +1,52 @@
+import copy
+import itertools
+import json
+
+import numpy as np
+import pytest
+
+pytest.importorskip('google.generativeai')
+
+from core.decision_engine import DecisionEngine, _strategy_codes, _strategy_outcome
+
+# Every cut, a value either side of it, and the ends of the 0-10 scale
+SCORES = [0, 3.9, 4, 4.5, 4.99, 5, 5.5, 5.99, 6, 6.5, 7, 7.5, 7.99, 8, 8.01, 9, 10]
+
+
+def test_strategy_table_matches_the_rules():
+    combos = np.array(list(itertools.product(SCORES, SCORES[::4], SCORES, SCORES[::2], [False, True])), dtype=object)
+    tech, macro, zs10, sentiment = (combos[:, i].astype(float) for i in range(4))
+    catalyst = combos[:, 4].astype(bool)
+
+    expected = [_strategy_outcome(*combo) for combo in combos]
+    assert _strategy_codes(tech, macro, zs10, sentiment, catalyst).tolist() == expected
+
+
+@pytest.fixture
+def engine(tmp_path):
+    metrics = {'jmoney_confirmation': {
+        'required_conditions': 2,
+        'rules': {'technical_score': 7, 'macro_score': 6, 'zs10_score_max': 5, 'catalyst_required': True},
+    }}
+    path = tmp_path / 'metrics.json'
+    path.write_text(json.dumps(metrics))
+    return DecisionEngine(str(path))
+
+
+def test_vectorized_engine_matches_run_engine(engine):
+    rng = np.random.default_rng(0)
+    assets = [
+        {
+            'ticker': f'T{i}',
+            'technical_score': float(rng.choice(SCORES)),
+            'macro_score': float(rng.choice(SCORES)),
+            'zs10_score': float(rng.choice(SCORES)),
+            'sentiment_score': float(rng.choice(SCORES)),
+            'catalyst_type': str(rng.choice(['None', 'Fed', 'earnings', 'Merger'])),
+        }
+        for i in range(300)
+    ]
+    # Missing scores fall back to each path's defaults
+    assets.append({'ticker': 'BARE'})
+
+    assert engine.run_engine_vectorized(copy.deepcopy(assets)) == engine.run_engine(copy.deepcopy(assets))
@@ -0,0 +1,30 @@
+from utils import jsonutil
+from utils.jsonutil import IncrementalJsonArrayParser
+
+
+def test_incremental_parser_yields_items_as_they_complete():
+    text = '```json\n[{"ticker": "AAPL", "note": "a, [b] {c}"}, {"ticker": "MS\\"FT"}, [1, 2]]\n```'
+    parser = IncrementalJsonArrayParser()
+    items = []
+    for i in range(0, len(text), 3):
+        items.extend(parser.feed(text[i:i + 3]))
+
+    assert items == [{'ticker': 'AAPL', 'note': 'a, [b] {c}'}, {'ticker': 'MS"FT'}, [1, 2]]
+    assert parser.started and parser.closed
+
+
+def test_incremental_parser_handles_empty_and_unterminated_arrays():
+    empty = IncrementalJsonArrayParser()
+    assert empty.feed('[ ]') == [] and empty.closed
+
+    partial = IncrementalJsonArrayParser()
+    assert partial.feed('[{"a": 1}, {"b"') == [{'a': 1}]
+    assert not partial.closed
+
+
+def test_dump_file_round_trip(tmp_path):
+    path = str(tmp_path / 'metrics.json')
+    jsonutil.dump_file(path, {'rules': {'technical_score': 7.5}}, indent=True)
+
+    assert jsonutil.load_file(path) == {'rules': {'technical_score': 7.5}}
+    assert jsonutil.load_config(path) == {'rules': {'technical_score': 7.5}}
@@ -0,0 +1,100 @@
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+pytest.importorskip('gspread')
+pytest.importorskip('oauth2client')
+pytest.importorskip('google.generativeai')
+
+from core.decision_engine import DecisionEngine
+from core.optimizer import Optimizer
+
+CANDIDATES = [
+    {'technical_score': tech, 'macro_score': macro, 'zs10_score_max': zs10, 'catalyst_required': catalyst}
+    for tech in (6.0, 7.5, 9.0) for macro in (5.0, 6.5) for zs10 in (4, 6) for catalyst in (False, True)
+]
+
+
+@pytest.fixture
+def signals():
+    rng = np.random.default_rng(1)
+    rows = [
+        {
+            'Technical Score': f"{rng.choice(np.arange(4, 10.5, 0.5))}/10",
+            'Macro Score': f"{rng.choice(np.arange(4, 10.5, 0.5))}/10",
+            'ZS-10+ Score': f"{rng.integers(0, 11)}/10",
+            'Catalyst': str(rng.choice(['None', 'Fed', 'N/A', 'Earnings'])),
+        }
+        for _ in range(200)
+    ]
+    rows.append({})
+    return rows
+
+
+@pytest.fixture
+def optimizer(tmp_path, monkeypatch):
+    monkeypatch.setenv('OPTIMIZER_CACHE_DIR', str(tmp_path / 'results'))
+    return Optimizer(output_manager=Mock(), metrics_path=str(tmp_path / 'metrics.json'), ai_analyzer=Mock())
+
+
+def engine_confirms(signal: dict, params: dict, required_conditions: int) -> bool:
+    engine = DecisionEngine.__new__(DecisionEngine)
+    engine.metrics = {'jmoney_confirmation': {'required_conditions': required_conditions, 'rules': params}}
+    engine._bind_rules()
+    asset = {'catalyst_type': signal.get('Catalyst', 'None')}
+    for column, key in (('Technical Score', 'technical_score'), ('Macro Score', 'macro_score'),
+                        ('ZS-10+ Score', 'zs10_score')):
+        if column in signal:
+            asset[key] = float(signal[column].split('/')[0])
+    if asset['catalyst_type'].lower() == 'n/a':
+        asset['catalyst_type'] = 'None'
+    return engine._check_jmoney_confirmation(asset)['jmoney_confirmed']
+
+
+@pytest.mark.parametrize('required_conditions', [1, 2, 3])
+def test_confirmed_mask_matches_the_decision_engine(signals, required_conditions):
+    scores = Optimizer._score_arrays(signals)
+    matrix = Optimizer._confirmed_matrix(scores, CANDIDATES, required_conditions)
+
+    for column, params in enumerate(CANDIDATES):
+        expected = [engine_confirms(signal, params, required_conditions) for signal in signals]
+        assert Optimizer._confirmed_mask(scores, params, required_conditions).tolist() == expected
+        assert matrix[:, column].tolist() == expected
+
+
+def test_win_rates_match_summarize(optimizer, signals):
+    scores = Optimizer._score_arrays(signals)
+    pnls = np.random.default_rng(2).normal(0, 50, len(signals))
+    pnls[::7] = np.nan
+
+    expected = [optimizer._evaluate(pnls, scores, params, 2)['win_rate'] for params in CANDIDATES]
+    for n_jobs in (1, 3):
+        np.testing.assert_allclose(optimizer._win_rates(pnls, scores, CANDIDATES, 2, n_jobs=n_jobs), expected)
+
+
+def test_equivalent_thresholds_share_one_memo_entry(optimizer, signals):
+    scores = Optimizer._score_arrays(signals)
+    pnls = np.zeros(len(signals))
+    optimizer.backtester.summarize = Mock(return_value={'win_rate': 50.0})
+
+    for params in ({'technical_score': 7.5, 'macro_score': 6}, {'technical_score': '7.50', 'macro_score': 6.0},
+                   {'macro_score': 6.04, 'technical_score': 7.5}):
+        optimizer._evaluate(pnls, scores, Optimizer._round_thresholds(params), 2)
+
+    assert optimizer.backtester.summarize.call_count == 1
+    # A different required_conditions is a different rule set
+    optimizer._evaluate(pnls, scores, Optimizer._round_thresholds({'technical_score': 7.5, 'macro_score': 6}), 3)
+    assert optimizer.backtester.summarize.call_count == 2
+
+
+def test_memoized_results_persist_across_instances(optimizer, signals, tmp_path):
+    scores = Optimizer._score_arrays(signals)
+    pnls = np.ones(len(signals))
+    params = {'technical_score': 7.0, 'macro_score': 6.0}
+    first = optimizer._evaluate(pnls, scores, params, 2)
+
+    fresh = Optimizer(output_manager=Mock(), metrics_path=str(tmp_path / 'metrics.json'), ai_analyzer=Mock())
+    fresh.backtester.summarize = Mock()
+    assert fresh._evaluate(pnls, scores, params, 2) == first
+    assert not fresh.backtester.summarize.called
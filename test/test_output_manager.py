@@ -0,0 +1,64 @@
+from unittest.mock import Mock
+
+import pytest
+
+pytest.importorskip('gspread')
+pytest.importorskip('oauth2client')
+
+from core.output_manager import OutputManager
+
+
+@pytest.fixture
+def manager():
+    manager = OutputManager.__new__(OutputManager)
+    manager.sheet_name = 'signals'
+    return manager
+
+
+def sheet(columns):
+    """A worksheet whose batch_get returns the given Ticker and Summary columns."""
+    worksheet = Mock()
+    worksheet.batch_get.return_value = columns
+    return worksheet
+
+
+def exported_rows(worksheet):
+    return worksheet.append_rows.call_args.args[0] if worksheet.append_rows.called else worksheet.update.call_args.args[0]
+
+
+def test_export_skips_rows_already_on_the_sheet_and_repeats_in_the_batch(manager, monkeypatch):
+    worksheet = sheet([[['Ticker'], ['AAPL'], ['MSFT']], [['Summary'], ['Earnings beat'], ['Cloud deal']]])
+    monkeypatch.setattr(manager, '_get_worksheet', lambda: worksheet)
+
+    manager.export_signals_to_sheets([
+        {'ticker': 'AAPL', 'catalyst': 'Earnings beat'},
+        {'ticker': 'AAPL', 'catalyst': 'New product'},
+        {'ticker': 'MSFT', 'catalyst': 'Earnings beat'},
+        {'ticker': 'AAPL', 'catalyst': 'New product'},
+    ])
+
+    rows = exported_rows(worksheet)
+    assert [(row[2], row[18]) for row in rows] == [('AAPL', 'New product'), ('MSFT', 'Earnings beat')]
+    worksheet.get_all_records.assert_not_called()
+
+
+def test_export_writes_headers_to_an_empty_sheet(manager, monkeypatch):
+    worksheet = sheet([[], []])
+    monkeypatch.setattr(manager, '_get_worksheet', lambda: worksheet)
+
+    manager.export_signals_to_sheets([{'ticker': 'AAPL', 'catalyst': 'Earnings beat', 'entry': None}])
+
+    rows = worksheet.update.call_args.args[0]
+    assert len(rows) == 2 and rows[0][:3] == ['Timestamp', 'Validee', 'Ticker']
+    assert rows[1][7] == 'N/A'
+    assert not worksheet.append_rows.called
+
+
+def test_export_falls_back_to_all_records_when_the_header_moved(manager, monkeypatch):
+    worksheet = sheet([[['Symbol'], ['AAPL']], [['Notes'], ['Earnings beat']]])
+    worksheet.get_all_records.return_value = [{'Ticker': 'AAPL', 'Summary': 'Earnings beat'}]
+    monkeypatch.setattr(manager, '_get_worksheet', lambda: worksheet)
+
+    manager.export_signals_to_sheets([{'ticker': 'AAPL', 'catalyst': 'Earnings beat'}])
+
+    assert exported_rows(worksheet) == []
@@ -0,0 +1,132 @@
+"""
+Thin JSON helpers that use orjson when it is installed and fall back to the stdlib json module.
+"""
+import copy
+import functools
+import json
+import os
+import tempfile
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one except clause covers both
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data):
+    """Parses JSON from a str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj, indent: bool = False) -> str:
+    """Serializes obj to a compact (or 2-space indented) JSON string."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None).decode('utf-8')
+        except TypeError:
+            # Types orjson refuses (e.g. non-str keys) go through the stdlib encoder below
+            pass
+    return json.dumps(obj, indent=2) if indent else json.dumps(obj, separators=(',', ':'))
+
+
+def load_file(path: str):
+    """Reads and parses a JSON file."""
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def dump_file(path: str, obj, indent: bool = False):
+    """
+    Writes obj as JSON (2-space indented if `indent`) atomically: the data goes to a temp file in
+    the same directory, which then replaces `path`, so readers never see a half-written file.
+    """
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(dumps(obj, indent=indent))
+        # mkstemp files are private (0600); keep the replaced file's permissions instead
+        os.chmod(tmp_path, os.stat(path).st_mode & 0o777 if os.path.exists(path) else 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+@functools.lru_cache(maxsize=16)
+def _load_file_cached(path: str, mtime: float):
+    return load_file(path)
+
+
+def load_config(path: str):
+    """
+    Reads a JSON config file, parsing it only once per file version (keyed on path and mtime,
+    so edits are picked up). Returns a fresh copy, so callers may modify it.
+    """
+    return copy.deepcopy(_load_file_cached(path, os.path.getmtime(path)))
+
+
+class IncrementalJsonArrayParser:
+    """
+    Incrementally parses a top-level JSON array fed in arbitrary text chunks (e.g. a streamed
+    model response). `feed` returns the items completed by that chunk, so each element can be
+    handled as soon as its closing brace arrives. Text before the opening '[' (such as a
+    markdown fence) and after the closing ']' is ignored.
+    """
+    def __init__(self):
+        self._item = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self.started = False
+        self.closed = False
+
+    def feed(self, chunk: str) -> list:
+        items = []
+        for ch in chunk:
+            if self.closed:
+                break
+            if not self.started:
+                if ch == '[':
+                    self.started = True
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                self._item.append(ch)
+                if self._escaped:
+                    self._escaped = False
+                elif ch == '\\':
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch in '[{':
+                self._depth += 1
+            elif ch in ']}':
+                self._depth -= 1
+                if self._depth == 0:
+                    # The top-level array itself closed
+                    self._flush(items)
+                    self.closed = True
+                    continue
+            elif ch == ',' and self._depth == 1:
+                self._flush(items)
+                continue
+            self._item.append(ch)
+        return items
+
+    def _flush(self, items: list):
+        text = ''.join(self._item).strip()
+        self._item = []
+        if text:
+            items.append(loads(text))
@@ -1,11 +1,22 @@
+import os
 import sys
 import threading
 import time
 import json
 
+# Message levels; anything below the logger's level is dropped before it is formatted
+DEBUG = 10
+INFO = 20
+ERROR = 40
+_LEVEL_NAMES = {'debug': DEBUG, 'info': INFO, 'error': ERROR}
+
 
 class Logger:
-    """A simple, clean logger for terminal output with lightweight metrics support."""
+    """A simple, clean logger for terminal output with lightweight metrics support.
+
+    The level comes from LOG_LEVEL (debug/info/error, default info). Messages accept
+    %-style args, which are only formatted when the message is actually written.
+    """
 
     _BLUE = '\033[94m'
     _GREEN = '\033[92m'
@@ -18,6 +29,17 @@ class Logger:
         # simple in-memory metrics registry: {metric_name: int}
         self._metrics = {}
         self._lock = threading.Lock()
+        self.level = _LEVEL_NAMES.get(os.environ.get('LOG_LEVEL', 'info').lower(), INFO)
+
+    def set_level(self, level: int):
+        self.level = level
+
+    def is_enabled_for(self, level: int) -> bool:
+        return level >= self.level
+
+    @staticmethod
+    def _format(message, args):
+        return message % args if args else message
 
     def _log(self, color, symbol, message):
         sys.stdout.write(f"{color}{symbol} {message}{Logger._ENDC}\n")
@@ -27,23 +49,38 @@ class Logger:
         sys.stdout.write(f"\n{Logger._BOLD}{Logger._BLUE}## {title.upper()} ##{Logger._ENDC}\n")
         sys.stdout.flush()
 
-    def log(self, message, indent=1):
+    def log(self, message, *args, indent=1):
+        if self.level > INFO:
+            return
+        prefix = "  " * indent
+        sys.stdout.write(f"{prefix}- {self._format(message, args)}\n")
+        sys.stdout.flush()
+
+    def debug(self, message, *args, indent=2):
+        if self.level > DEBUG:
+            return
         prefix = "  " * indent
-        sys.stdout.write(f"{prefix}- {message}\n")
+        sys.stdout.write(f"{prefix}· {self._format(message, args)}\n")
         sys.stdout.flush()
 
-    def info(self, message, indent=2):
+    def info(self, message, *args, indent=2):
+        if self.level > INFO:
+            return
         prefix = "  " * indent
-        sys.stdout.write(f"{Logger._YELLOW}{prefix}ℹ {message}{Logger._ENDC}\n")
+        sys.stdout.write(f"{Logger._YELLOW}{prefix}ℹ {self._format(message, args)}{Logger._ENDC}\n")
         sys.stdout.flush()
 
-    def success(self, message, indent=1):
+    def success(self, message, *args, indent=1):
+        if self.level > INFO:
+            return
         prefix = "  " * indent
-        self._log(Logger._GREEN, f"{prefix}✅", message)
+        self._log(Logger._GREEN, f"{prefix}✅", self._format(message, args))
 
-    def fail(self, message, indent=1):
+    def fail(self, message, *args, indent=1):
+        if self.level > ERROR:
+            return
         prefix = "  " * indent
-        self._log(Logger._RED, f"{prefix}❌", message)
+        self._log(Logger._RED, f"{prefix}❌", self._format(message, args))
 
     # Structured logging helper that prints a JSON line with timestamp
     def structured(self, event: str, **fields):